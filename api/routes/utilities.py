@@ -3,6 +3,7 @@ Utilities API Routes
 Handles calculator, LoRA utilities, and HuggingFace uploads via new service layer.
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -153,39 +154,17 @@ async def calculate_steps(request: CalculatorRequest):
         folder_name = dataset_path.name
         repeats, caption = extract_kohya_params(folder_name)
 
-        # Count images in dataset
-        images = count_images_in_directory(dataset_path)
+        # Count images in dataset (directory walk runs off the event loop)
+        images = await asyncio.to_thread(count_images_in_directory, dataset_path)
 
         if images == 0:
             raise HTTPException(status_code=400, detail=f"No images found in: {dataset_path}")
 
-        # Calculate total steps using Kohya's exact logic
-        total_steps = (images * repeats * request.epochs) // request.batch_size
-
-        # Time estimation (approximate)
-        time_estimate_min = (total_steps * 2) / 60  # GPU rental (faster)
-        time_estimate_max = (total_steps * 4) / 60  # Home GPU
-
-        # Recommendation
-        if total_steps < 500:
-            recommendation = "⚠️ Low step count - may underfit. Consider more epochs or repeats."
-        elif total_steps > 5000:
-            recommendation = "⚠️ High step count - may overfit. Consider fewer epochs."
-        else:
-            recommendation = "✅ Good step count for most LoRA training scenarios."
-
         return CalculatorResponse(
             success=True,
-            dataset_path=dataset_path,
-            images=images,
-            repeats=repeats,
-            epochs=request.epochs,
-            batch_size=request.batch_size,
-            total_steps=total_steps,
+            dataset_path=str(dataset_path),
             caption=caption,
-            time_estimate_min=time_estimate_min,
-            time_estimate_max=time_estimate_max,
-            recommendation=recommendation
+            **calculate_training_steps(images, repeats, request.epochs, request.batch_size)
         )
 
     except HTTPException:
@@ -913,6 +892,37 @@ async def bake_chattiori_status(job_id: str):
 
 # ========== Helper Functions ==========
 
+def calculate_training_steps(images: int, repeats: int, epochs: int, batch_size: int) -> dict:
+    """
+    Kohya step count, time estimate and recommendation for a dataset.
+
+    Pure computation (no filesystem access), so it can be called directly
+    from other routes or services.
+    """
+    # Calculate total steps using Kohya's exact logic
+    total_steps = (images * repeats * epochs) // batch_size
+
+    # Recommendation
+    if total_steps < 500:
+        recommendation = "⚠️ Low step count - may underfit. Consider more epochs or repeats."
+    elif total_steps > 5000:
+        recommendation = "⚠️ High step count - may overfit. Consider fewer epochs."
+    else:
+        recommendation = "✅ Good step count for most LoRA training scenarios."
+
+    return {
+        "images": images,
+        "repeats": repeats,
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "total_steps": total_steps,
+        # Time estimation (approximate)
+        "time_estimate_min": (total_steps * 2) / 60,  # GPU rental (faster)
+        "time_estimate_max": (total_steps * 4) / 60,  # Home GPU
+        "recommendation": recommendation,
+    }
+
+
 def extract_kohya_params(folder_name: str):
     """Extract repeat count from Kohya-format folder name"""
     tokens = folder_name.split("_")
@@ -925,11 +935,27 @@ def extract_kohya_params(folder_name: str):
     return n_repeats, caption_by_folder
 
 
+_IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp'})
+
+
 def count_images_in_directory(directory):
-    """Count image files in directory"""
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp'}
+    """Count image files in directory (recursively).
+
+    Walks the tree once with os.scandir; DirEntry.is_dir/is_file use the type
+    returned by the directory read, so there is no extra stat per entry.
+    """
     image_count = 0
-    for file_path in Path(directory).rglob('*'):
-        if file_path.suffix.lower() in image_extensions:
-            image_count += 1
+    pending = [os.fspath(directory)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        stem, _, ext = entry.name.rpartition('.')
+                        if stem and ext.lower() in _IMAGE_EXTENSIONS:
+                            image_count += 1
+        except OSError:
+            continue
     return image_count
@@ -16,6 +16,9 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+# Environment variables worth reporting when debugging Python/PATH issues
+IMPORTANT_ENV_VARS = ("PATH", "PYTHONPATH", "PYTHONHOME", "VIRTUAL_ENV", "LOCALAPPDATA", "APPDATA", "TEMP", "TMP")
+
 
 def run_command(cmd, shell=False):
     """Run command and return dict with success, stdout, stderr, and returncode."""
@@ -67,13 +70,13 @@ def get_python_installations():
     }
 
     if platform.system() == "Windows":
-        py_list = run_command(["py", "--list-paths"], shell=True)
+        py_list = run_command(["py", "--list-paths"])
         pythons["py_launcher_list"] = py_list.get("stdout", "Not available")
 
-        py_3_path = run_command(["py", "-3", "-c", "import sys; print(sys.executable)"], shell=True)
+        py_3_path = run_command(["py", "-3", "-c", "import sys; print(sys.executable)"])
         pythons["py_3_resolves_to"] = py_3_path.get("stdout", "Not available")
 
-        py_version = run_command(["py", "-3", "--version"], shell=True)
+        py_version = run_command(["py", "-3", "--version"])
         pythons["py_3_version"] = py_version.get("stdout", "Not available")
 
     for cmd in ["python", "python3", "python3.11", "python3.10"]:
@@ -89,13 +92,7 @@ def get_python_installations():
 
 def check_environment():
     """Check environment variables related to Python."""
-    env_vars = {}
-    important_vars = ["PATH", "PYTHONPATH", "PYTHONHOME", "VIRTUAL_ENV", "LOCALAPPDATA", "APPDATA", "TEMP", "TMP"]
-
-    for var in important_vars:
-        env_vars[var] = os.environ.get(var, "Not set")
-
-    return env_vars
+    return {var: os.environ.get(var, "Not set") for var in IMPORTANT_ENV_VARS}
 
 
 def check_install_location():
@@ -266,13 +263,19 @@ def check_installer_files():
         "installer_windows_local.py",
     ]
 
+    # One directory read instead of an exists() + two stat() calls per file
+    with os.scandir(project_root) as it:
+        entries = {e.name: e for e in it}
+
     for filename in installer_files:
         filepath = project_root / filename
-        if filepath.exists():
+        entry = entries.get(filename)
+        if entry is not None:
+            st = entry.stat()
             installer_info[filename] = {
                 "exists": True,
-                "size": filepath.stat().st_size,
-                "modified": datetime.fromtimestamp(filepath.stat().st_mtime).isoformat(),
+                "size": st.st_size,
+                "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
             }
 
             if filename == "install.bat":
@@ -289,7 +292,7 @@ def check_installer_files():
 
     # Check for install marker
     marker = project_root / "install_complete.marker"
-    if marker.exists():
+    if "install_complete.marker" in entries:
         try:
             installer_info[".install_complete"] = {
                 "exists": True,
@@ -310,17 +313,27 @@ def check_venv_state():
 
     venv_names = [".venv", "venv", "env"]
 
+    if platform.system() == "Windows":
+        bin_dir, python_name = "Scripts", "python.exe"
+    else:
+        bin_dir, python_name = "bin", "python"
+
+    with os.scandir(project_root) as it:
+        entries = {e.name: e for e in it}
+
     for venv_name in venv_names:
         venv_path = project_root / venv_name
-        if venv_path.exists():
+        if venv_name in entries:
             venv_info[venv_name] = {"exists": True, "path": str(venv_path.absolute())}
 
-            if platform.system() == "Windows":
-                venv_python = venv_path / "Scripts" / "python.exe"
-            else:
-                venv_python = venv_path / "bin" / "python"
+            venv_python = venv_path / bin_dir / python_name
+            try:
+                with os.scandir(venv_path / bin_dir) as it:
+                    has_python = any(e.name == python_name for e in it)
+            except OSError:
+                has_python = False
 
-            if venv_python.exists():
+            if has_python:
                 venv_version = run_command([str(venv_python), "--version"])
                 venv_info[venv_name]["python_version"] = venv_version.get("stdout", "Unknown")
 
@@ -371,28 +384,23 @@ def check_dependencies():
 
 
 def check_disk_space():
-    """Check available disk space."""
+    """Check available disk space (raw bytes; GB/percent are derived when reporting)."""
     project_root = Path.cwd()
 
     if platform.system() == "Windows":
         drive = Path(project_root.anchor)
         usage = shutil.disk_usage(drive)
-        return {
-            "drive": str(drive),
-            "total_gb": round(usage.total / (1024**3), 2),
-            "used_gb": round(usage.used / (1024**3), 2),
-            "free_gb": round(usage.free / (1024**3), 2),
-            "percent_used": round(usage.used / usage.total * 100, 2),
-        }
+        location = {"drive": str(drive)}
     else:
         usage = shutil.disk_usage("/")
-        return {
-            "mount": "/",
-            "total_gb": round(usage.total / (1024**3), 2),
-            "used_gb": round(usage.used / (1024**3), 2),
-            "free_gb": round(usage.free / (1024**3), 2),
-            "percent_used": round(usage.used / usage.total * 100, 2),
-        }
+        location = {"mount": "/"}
+
+    return {**location, "total": usage.total, "used": usage.used, "free": usage.free}
+
+
+def _gb(num_bytes):
+    """Convert a byte count to gigabytes, rounded for display."""
+    return round(num_bytes / (1024**3), 2)
 
 
 def check_frontend_state():
@@ -427,13 +435,16 @@ def analyze_issues(diagnostics):
     location = diagnostics.get("install_location", {})
     issues.extend(location.get("issues", []))
 
+    pythons = diagnostics["python_installations"]
+    cur_py = pythons["current"]
+
     # Python version
-    current_py = diagnostics["python_installations"]["current"]["version_info"]
+    current_py = cur_py["version_info"]
     if current_py["major"] < 3 or (current_py["major"] == 3 and current_py["minor"] < 10):
         issues.append(f"CRITICAL: Python {current_py['major']}.{current_py['minor']} is too old (requires 3.10+)")
 
     # Microsoft Store Python
-    if "WindowsApps" in diagnostics["python_installations"]["current"]["executable"]:
+    if "WindowsApps" in cur_py["executable"]:
         issues.append(
             "WARNING: Using Microsoft Store Python. This frequently causes PATH conflicts "
             "and permission issues. Install from python.org instead."
@@ -441,7 +452,7 @@ def analyze_issues(diagnostics):
 
     # Multiple Python installations pointing to different places
     py_exes = set()
-    for key, val in diagnostics["python_installations"].items():
+    for key, val in pythons.items():
         if key.endswith("_executable") and isinstance(val, str) and val != "Not available":
             py_exes.add(val.strip().lower())
     if len(py_exes) > 1:
@@ -471,11 +482,11 @@ def analyze_issues(diagnostics):
         issues.append("WARNING: LyCORIS not installed. LoHa/LoKr/LoCon training will not work.")
 
     # Disk space
-    disk = diagnostics["disk_space"]
-    if disk["free_gb"] < 20:
-        issues.append(f"CRITICAL: Very low disk space: {disk['free_gb']} GB free. Need at least 20 GB.")
-    elif disk["free_gb"] < 50:
-        issues.append(f"WARNING: Low disk space: {disk['free_gb']} GB free (50+ GB recommended for models).")
+    free_gb = _gb(diagnostics["disk_space"]["free"])
+    if free_gb < 20:
+        issues.append(f"CRITICAL: Very low disk space: {free_gb} GB free. Need at least 20 GB.")
+    elif free_gb < 50:
+        issues.append(f"WARNING: Low disk space: {free_gb} GB free (50+ GB recommended for models).")
 
     # Node.js
     if not diagnostics["dependencies"]["node"]["available"]:
@@ -516,8 +527,11 @@ def main():
     print("Collecting system information...")
     print()
 
+    # One clock read shared by the report timestamp and the output filenames
+    now = datetime.now()
+
     diagnostics = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "platform": {
             "system": platform.system(),
             "release": platform.release(),
@@ -546,7 +560,7 @@ def main():
     # Output to logs/ directory instead of project root
     logs_dir = Path.cwd() / "logs"
     logs_dir.mkdir(exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
 
     # Save JSON
     json_filename = logs_dir / f"diagnostics_{timestamp}.json"
@@ -581,14 +595,16 @@ def main():
         f.write("=" * 70 + "\n")
         f.write("PYTHON INSTALLATIONS\n")
         f.write("=" * 70 + "\n")
-        f.write(f"Current Python: {diagnostics['python_installations']['current']['executable']}\n")
-        f.write(f"Version: {diagnostics['python_installations']['current']['version']}\n")
-        f.write(f"In Virtual Env: {diagnostics['python_installations']['current']['is_venv']}\n\n")
+        pythons = diagnostics["python_installations"]
+        cur_py = pythons["current"]
+        f.write(f"Current Python: {cur_py['executable']}\n")
+        f.write(f"Version: {cur_py['version']}\n")
+        f.write(f"In Virtual Env: {cur_py['is_venv']}\n\n")
 
-        if "py_launcher_list" in diagnostics["python_installations"]:
+        if "py_launcher_list" in pythons:
             f.write("Windows py launcher output:\n")
-            f.write(diagnostics["python_installations"]["py_launcher_list"] + "\n\n")
-            f.write(f"py -3 resolves to: {diagnostics['python_installations'].get('py_3_resolves_to', 'Unknown')}\n\n")
+            f.write(pythons["py_launcher_list"] + "\n\n")
+            f.write(f"py -3 resolves to: {pythons.get('py_3_resolves_to', 'Unknown')}\n\n")
 
         # GPU
         f.write("=" * 70 + "\n")
@@ -684,9 +700,10 @@ def main():
         f.write("=" * 70 + "\n")
         disk = diagnostics["disk_space"]
         f.write(f"Drive/Mount: {disk.get('drive') or disk.get('mount')}\n")
-        f.write(f"Total: {disk['total_gb']} GB\n")
-        f.write(f"Used: {disk['used_gb']} GB ({disk['percent_used']}%)\n")
-        f.write(f"Free: {disk['free_gb']} GB\n")
+        percent_used = round(disk["used"] / disk["total"] * 100, 2) if disk["total"] else 0
+        f.write(f"Total: {_gb(disk['total'])} GB\n")
+        f.write(f"Used: {_gb(disk['used'])} GB ({percent_used}%)\n")
+        f.write(f"Free: {_gb(disk['free'])} GB\n")
         f.write("\n")
 
         # Issues summary
@@ -12,37 +12,84 @@ Installs CUDA 12.1 dependencies. Does NOT assume root or cloud environment.
 
 import argparse
 import datetime
+import functools
+import hashlib
+import importlib.metadata
 import logging
 import os
+import platform
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# _IOWR('F', NV_ESC_CHECK_VERSION_STR, nv_ioctl_rm_api_version_t) — 72-byte version query
+NVIDIA_VERSION_IOCTL = 0xC04846D2
+
+# The vendored packages' runtime deps all come from requirements_linux.txt, which is
+# installed first, so skip re-resolving them and building a throwaway isolated env.
+EDITABLE_INSTALL_FLAGS = ["--no-deps", "--no-build-isolation"]
+
+# Opt-in local wheelhouse (set KTISEOS_WHEELHOUSE=1): after a successful install,
+# keep wheels of the exact installed versions in wheels/ so reinstalls into a
+# fresh venv work offline. Off by default since it duplicates site-packages on disk.
+WHEELHOUSE_ENABLED = bool(os.environ.get("KTISEOS_WHEELHOUSE"))
+
+# Never frozen into the wheelhouse: install_pytorch_cuda121 owns the CUDA build,
+# and the torch/nvidia wheels alone are several GB.
+WHEELHOUSE_EXCLUDE = frozenset({"torch", "torchvision", "torchaudio"})
+
+# Applied to every command run_command launches: no self-update check or prompts
+# from pip, no .pyc writes, and no ANSI colour codes in the captured log output.
+COMMAND_ENV = {
+    "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    "PIP_NO_INPUT": "1",
+    "PIP_NO_COLOR": "1",
+    "PYTHONDONTWRITEBYTECODE": "1",
+}
 
 
 class LocalLinuxInstaller:
     def __init__(self, verbose=False, skip_install=False, force=False):
-        self.project_root = os.path.dirname(os.path.abspath(__file__))
+        self.project_root = Path(__file__).resolve().parent
         self.verbose = verbose
         self.skip_install = skip_install
         self.force = force
-        self.install_marker = os.path.join(self.project_root, ".install_complete")
-        self.setup_logging()
+        self.install_marker = self.project_root / ".install_complete"
         self.python_cmd = sys.executable
-        self.package_manager = {
-            "name": "pip",
-            "install_cmd": [self.python_cmd, "-m", "pip", "install"],
-            "available": True,
-        }
-        self.trainer_dir = os.path.join(self.project_root, "trainer")
-        self.derrian_dir = os.path.join(self.trainer_dir, "derrian_backend")
-        self.sd_scripts_dir = os.path.join(self.derrian_dir, "sd_scripts")
-        self.lycoris_dir = os.path.join(self.derrian_dir, "lycoris")
+        self.trainer_dir = self.project_root / "trainer"
+        self.derrian_dir = self.trainer_dir / "derrian_backend"
+        self.sd_scripts_dir = self.derrian_dir / "sd_scripts"
+        self.lycoris_dir = self.derrian_dir / "lycoris"
+        # Pins from the installed environment, passed to editable installs with -c
+        self.constraints_file = None
+        # Cached has_nvidia_gpu() result; None until first probed
+        self._nvidia_gpu = None
+        # Serializes console output when commands run on worker threads
+        self._console_lock = threading.Lock()
+
+    # Logging and package-manager detection are deferred until first use, so
+    # constructing the installer only to call a probe creates no log file.
+    @functools.cached_property
+    def log_file(self):
+        logs_dir = self.project_root / "logs"
+        logs_dir.mkdir(exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        return logs_dir / f"installer_local_linux_{timestamp}.log"
+
+    @functools.cached_property
+    def logger(self):
+        return self.setup_logging()
+
+    @functools.cached_property
+    def package_manager(self):
+        return self.detect_package_manager()
 
     def setup_logging(self):
-        logs_dir = os.path.join(self.project_root, "logs")
-        os.makedirs(logs_dir, exist_ok=True)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(logs_dir, f"installer_local_linux_{timestamp}.log")
+        log_file = self.log_file
         log_level = logging.DEBUG if self.verbose else logging.INFO
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
         file_handler = logging.FileHandler(log_file, encoding="utf-8")
@@ -51,12 +98,32 @@ class LocalLinuxInstaller:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        self.logger = logging.getLogger("local_linux_installer")
-        self.logger.setLevel(logging.DEBUG)
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        self.log_file = log_file
-        self.logger.info("Local Linux Installer started - Log: %s", log_file)
+        logger = logging.getLogger("local_linux_installer")
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
+        logger.info("Local Linux Installer started - Log: %s", log_file)
+        return logger
+
+    def detect_package_manager(self):
+        """Use uv when it is already on PATH; otherwise pip.
+
+        Unlike the remote installer this never bootstraps uv — a local machine
+        only gets it if the user installed it. --index-strategy unsafe-best-match
+        lets the PyTorch extra index and PyPI be consulted together, as pip does.
+        """
+        uv = shutil.which("uv")
+        if uv:
+            self.logger.info("Using uv for package installation: %s", uv)
+            return {
+                "name": "uv",
+                "install_cmd": [
+                    uv, "pip", "install", "--python", self.python_cmd,
+                    "--index-strategy", "unsafe-best-match",
+                ],
+                "available": True,
+            }
+        return {"name": "pip", "install_cmd": [self.python_cmd, "-m", "pip", "install"], "available": True}
 
     def print_banner(self):
         print("=" * 70)
@@ -64,47 +131,116 @@ class LocalLinuxInstaller:
         print("  For NVIDIA GPU development (CUDA 12.1)")
         print("=" * 70)
 
+    def _print(self, message):
+        with self._console_lock:
+            print(message)
+
     def run_command(self, command, description, cwd=None, allow_failure=False):
         self.logger.info(" %s...", description)
         if not self.verbose:
-            print(f" {description}...")
+            self._print(f" {description}...")
+        env = {**os.environ, **COMMAND_ENV}
         try:
             if self.verbose:
-                subprocess.run(command, check=True, cwd=cwd, text=True)
+                subprocess.run(command, check=True, cwd=cwd, env=env, text=True)
             else:
-                subprocess.run(command, check=True, cwd=cwd, capture_output=True, text=True)
+                self._run_logged(command, cwd, env)
             self.logger.info(" %s successful.", description)
             if not self.verbose:
-                print(f" ✅ {description} successful.")
+                self._print(f" ✅ {description} successful.")
             return True
         except subprocess.CalledProcessError as e:
-            print(f" ❌ {description} failed.")
+            self._print(f" ❌ {description} failed.")
             if not self.verbose:
-                print(f"    Check log: {self.log_file}")
+                self._print(f"    Check log: {self.log_file}")
             self.logger.error("%s failed: %s", description, e)
             return False if not allow_failure else True
         except Exception as e:
-            print(f" ❌ Unexpected error during {description}: {e}")
+            self._print(f" ❌ Unexpected error during {description}: {e}")
             self.logger.error("Unexpected error: %s", e)
             return False
 
-    def has_nvidia_gpu(self):
-        """Check if NVIDIA GPU is available (via nvidia-smi or CUDA)"""
-        if shutil.which("nvidia-smi"):
-            return True
+    def _run_logged(self, command, cwd, env):
+        """Run command, streaming its output line by line into the log file.
+
+        stderr is merged into stdout, so one pipe drains in this thread and
+        nothing is held in memory beyond the current line.
+        """
+        with subprocess.Popen(
+            command, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace",
+        ) as proc:
+            for line in proc.stdout:
+                self.logger.debug("%s", line.rstrip())
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command)
+
+    def _probe_nvidia_ioctl(self):
+        """Ask the NVIDIA kernel driver for its version via /dev/nvidiactl.
+
+        Returns True if the driver answers, False if the device node exists but
+        the driver does not respond, and None if there is no device node (no
+        driver loaded), in which case callers fall back to other probes.
+        """
         try:
-            import torch
+            fd = os.open("/dev/nvidiactl", os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            import fcntl
+            import struct
+
+            # NV_ESC_CHECK_VERSION_STR: nv_ioctl_rm_api_version_t {u32 cmd; u32 reply; char version[64]},
+            # issued with NV_RM_API_VERSION_CMD_QUERY so no client version is asserted.
+            request = struct.pack("<II64s", ord("2"), 0, b"")
+            reply = fcntl.ioctl(fd, NVIDIA_VERSION_IOCTL, request)
+            version = struct.unpack("<II64s", reply)[2].split(b"\0", 1)[0].decode(errors="replace")
+            self.logger.info("NVIDIA driver detected via /dev/nvidiactl: %s", version or "unknown version")
+            return True
+        except (ImportError, OSError) as e:
+            self.logger.warning("/dev/nvidiactl present but driver did not respond: %s", e)
+            return False
+        finally:
+            os.close(fd)
 
-            return torch.cuda.is_available()
-        except ImportError:
+    def has_nvidia_gpu(self):
+        """Check if NVIDIA GPU is available (probed once, then cached)"""
+        if self._nvidia_gpu is None:
+            self._nvidia_gpu = self._detect_nvidia_gpu()
+        return self._nvidia_gpu
+
+    def _detect_nvidia_gpu(self):
+        """Driver ioctl first, then nvidia-smi."""
+        probed = self._probe_nvidia_ioctl()
+        if probed is not None:
+            return probed
+        nvidia_smi = shutil.which("nvidia-smi")
+        if not nvidia_smi:
+            return False
+        # -L only lists devices, so it answers fast; the timeout guards against a wedged driver
+        try:
+            result = subprocess.run([nvidia_smi, "-L"], capture_output=True, text=True, timeout=2)
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.warning("nvidia-smi probe failed: %s", e)
             return False
+        return result.returncode == 0 and "GPU" in result.stdout
 
-    def verify_vendored_backend(self):
-        if not os.path.exists(self.derrian_dir):
+    def _scan_backend(self):
+        """Entry names in the vendored backend dir, or None if it is missing."""
+        try:
+            with os.scandir(self.derrian_dir) as it:
+                return {e.name for e in it}
+        except OSError:
+            return None
+
+    def verify_vendored_backend(self, present=None):
+        if present is None:
+            present = self._scan_backend()
+        if present is None:
             print(f" ❌ Vendored backend missing: {self.derrian_dir}")
             return False
         for name, path in [("sd_scripts", self.sd_scripts_dir), ("lycoris", self.lycoris_dir)]:
-            if not os.path.exists(path):
+            if name not in present:
                 print(f" ❌ Required dir '{name}' missing: {path}")
                 return False
         print(" ✅ Vendored backend verified")
@@ -115,27 +251,171 @@ class LocalLinuxInstaller:
             print(" ⏩ Skipping dependency installation")
             return True
         # Use Linux-specific requirements file (includes PyTorch with CUDA 12.1)
-        req_file = os.path.join(self.project_root, "requirements_linux.txt")
-        if not os.path.exists(req_file):
+        req_file = self.project_root / "requirements_linux.txt"
+        if not req_file.is_file():
             print(f" ❌ {req_file} not found")
             return False
 
-        # Add CUDA 12.1 index for PyTorch installation
-        cmd = [
-            self.python_cmd, "-m", "pip", "install",
-            "-r", req_file,
-            "--extra-index-url", "https://download.pytorch.org/whl/cu121"
-        ]
-        return self.run_command(cmd, "Installing Python dependencies")
+        return self.install_requirements(req_file)
+
+    def install_requirements(self, req_file):
+        """Install requirements, from the local wheel cache when it matches req_file."""
+        sorted_req = self.write_sorted_requirements(req_file)
+        try:
+            return self._install_requirements(req_file, sorted_req)
+        finally:
+            os.remove(sorted_req)
+
+    def write_sorted_requirements(self, req_file):
+        """Write req_file with its requirement lines in a stable, case-insensitive order.
+
+        Option lines (-r, --extra-index-url, ...) keep their original order at the
+        top; comments and blank lines are dropped. Whole lines are sorted, so
+        environment markers stay attached. The copy lives next to req_file so
+        relative -r includes still resolve.
+        """
+        lines = [line.strip() for line in req_file.read_text(encoding="utf-8").splitlines()]
+        options = [line for line in lines if line.startswith("-")]
+        requirements = sorted(
+            (line for line in lines if line and not line.startswith(("#", "-"))), key=str.lower
+        )
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", suffix=".txt", prefix=".sorted_",
+            dir=req_file.parent, delete=False,
+        ) as f:
+            f.write("\n".join(options + requirements) + "\n")
+        return f.name
+
+    def _install_requirements(self, req_file, sorted_req):
+        # Wheels over sdists, and no .pyc pass over the whole ML stack at install
+        # time — modules get byte-compiled lazily on first import instead. uv
+        # already behaves this way and rejects the pip spellings.
+        pip_flags = ["--prefer-binary", "--no-compile"] if self.package_manager["name"] == "pip" else []
+        index_flags = ["--extra-index-url", "https://download.pytorch.org/whl/cu121"]
+        wheels_dir = self.project_root / "wheels"
+        wheels_key = self.wheel_cache_key(req_file) if WHEELHOUSE_ENABLED else None
+
+        # Pre-seed the environment offline from the wheelhouse. The index install
+        # below then only has to fetch what the wheelhouse leaves out (the
+        # PyTorch stack); everything else is already satisfied.
+        if wheels_key and self.wheel_cache_valid(wheels_key, wheels_dir):
+            cmd = self.package_manager["install_cmd"] + pip_flags + [
+                "--no-index", "--find-links", wheels_dir, "-r", wheels_dir / "requirements.lock",
+            ]
+            if not self.run_command(cmd, "Installing Python dependencies (local wheel cache)"):
+                self.logger.warning("Install from local wheel cache failed, falling back to package indexes")
+
+        cmd = self.package_manager["install_cmd"] + pip_flags + ["-r", sorted_req, *index_flags]
+        success = self.run_command(cmd, f"Installing Python dependencies with {self.package_manager['name']}")
+
+        # If uv hits a flag/resolver quirk, retry the same requirements with pip.
+        if not success and self.package_manager["name"] == "uv":
+            self.logger.warning("uv install failed — retrying with pip")
+            self.package_manager = {
+                "name": "pip", "install_cmd": [self.python_cmd, "-m", "pip", "install"], "available": True,
+            }
+            cmd = self.package_manager["install_cmd"] + ["--prefer-binary", "--no-compile", "-r", sorted_req, *index_flags]
+            success = self.run_command(cmd, "Installing Python dependencies with pip (fallback)")
+        if success and wheels_key and not self.wheel_cache_valid(wheels_key, wheels_dir):
+            self.save_wheel_cache(wheels_key, wheels_dir)
+        return success
+
+    def requirements_hash(self, req_file):
+        """SHA-256 of req_file plus any files it pulls in with -r."""
+        digest = hashlib.sha256()
+        pending = [req_file]
+        while pending:
+            path = pending.pop()
+            content = path.read_bytes()
+            digest.update(content)
+            for line in content.decode("utf-8", errors="replace").splitlines():
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] in ("-r", "--requirement"):
+                    pending.append(path.parent / parts[1])
+        return digest.hexdigest()
+
+    def wheel_cache_key(self, req_file):
+        """Wheelhouse key: the requirements plus the Python version and platform the wheels are built for."""
+        return hashlib.sha256(
+            "\0".join([self.requirements_hash(req_file), sys.version, platform.platform()]).encode("utf-8")
+        ).hexdigest()
+
+    def wheel_cache_valid(self, wheels_key, wheels_dir):
+        hash_file = self.project_root / "logs" / ".wheel_cache_hash"
+        if not wheels_dir.is_dir() or not hash_file.is_file():
+            return False
+        return hash_file.read_text(encoding="utf-8").strip() == wheels_key
+
+    def save_wheel_cache(self, wheels_key, wheels_dir):
+        """Rebuild wheels/ from exactly what the index install just put in place.
+
+        Stale wheels from earlier requirements are deleted first. Pins come from
+        the installed distributions, so nothing is re-resolved; the PyTorch stack
+        and editable/direct-URL installs are left out. Non-fatal.
+        """
+        hash_file = self.project_root / "logs" / ".wheel_cache_hash"
+        hash_file.unlink(missing_ok=True)
+        shutil.rmtree(wheels_dir, ignore_errors=True)
+        wheels_dir.mkdir()
+        pins = [pin for name, pin in sorted(self.installed_pins().items()) if name not in WHEELHOUSE_EXCLUDE]
+        lock_file = wheels_dir / "requirements.lock"
+        lock_file.write_text("\n".join(pins) + "\n", encoding="utf-8")
+        cmd = [self.python_cmd, "-m", "pip", "wheel", "--no-deps", "--prefer-binary", "-w", wheels_dir, "-r", lock_file]
+        if self.run_command(cmd, "Saving local wheel cache"):
+            hash_file.write_text(wheels_key + "\n", encoding="utf-8")
+
+    @staticmethod
+    def installed_pins():
+        """{lowercased name: "Name==version"} for every distribution installed from an index.
+
+        Read from importlib.metadata rather than a pip freeze subprocess. Editable
+        and direct-URL installs (anything with a direct_url.json) are left out.
+        """
+        pins = {}
+        for dist in importlib.metadata.distributions():
+            name = dist.metadata["Name"]
+            if not name or dist.read_text("direct_url.json") is not None:
+                continue
+            pins[name.lower()] = f"{name}=={dist.version}"
+        return pins
+
+    def write_installed_constraints(self):
+        """Pin every distribution installed from an index to its current version.
+
+        Editable and direct-URL installs are left out (see installed_pins) so they
+        can never conflict with the -e targets being installed.
+        """
+        pins = self.installed_pins()
+        constraints = self.project_root / "logs" / "installed_constraints.txt"
+        constraints.write_text("\n".join(sorted(pins.values())) + "\n", encoding="utf-8")
+        self.logger.info("Wrote %d install constraints to %s", len(pins), constraints)
+        return constraints
+
+    def editable_install_flags(self):
+        flags = list(EDITABLE_INSTALL_FLAGS)
+        if self.constraints_file:
+            flags += ["-c", str(self.constraints_file)]
+        return flags
+
+    def build_editable_plan(self):
+        """Build a single pip command installing every vendored package in editable mode."""
+        cmd = self.package_manager["install_cmd"] + self.editable_install_flags()
+        for _name, path in self.editable_packages():
+            cmd += ["-e", path]
+        return cmd
 
     def install_pytorch_cuda121(self):
         if self.has_nvidia_gpu():
+            try:
+                installed = importlib.metadata.version("torch")
+            except importlib.metadata.PackageNotFoundError:
+                installed = None
+            if installed == "2.4.0+cu121":
+                print(" ✅ PyTorch 2.4.0+cu121 already installed")
+                self.logger.info("PyTorch already satisfied: %s", installed)
+                return True
             print(" 📦 Installing PyTorch with CUDA 12.1...")
-            cmd = [
-                self.python_cmd,
-                "-m",
-                "pip",
-                "install",
+            cmd = self.package_manager["install_cmd"] + [
                 "torch==2.4.0",
                 "torchvision==0.19.0",
                 "--index-url",
@@ -147,8 +427,10 @@ class LocalLinuxInstaller:
             print("    Install manually if needed: pip install torch torchvision")
             return True
 
-    def check_aria2c(self):
-        if not shutil.which("aria2c"):
+    def check_aria2c(self, aria2c=None):
+        if aria2c is None:
+            aria2c = shutil.which("aria2c")
+        if not aria2c:
             print(" ⚠️ aria2c not found")
             print("    Required for dataset downloads. Install with:")
             print("      Ubuntu/Debian: sudo apt install aria2")
@@ -156,21 +438,60 @@ class LocalLinuxInstaller:
         else:
             print(" ✅ aria2c found")
 
+    def editable_packages(self):
+        """Return (name, path) for each vendored package that has a setup.py."""
+        return [
+            (name, path)
+            for name, path in [
+                ("LyCORIS", self.lycoris_dir),
+                ("Custom Optimizers", self.derrian_dir / "custom_scheduler"),
+                ("Kohya SD Scripts", self.sd_scripts_dir),
+            ]
+            if (path / "setup.py").is_file()
+        ]
+
     def apply_editable_installs(self):
-        for name, path in [
-            ("LyCORIS", self.lycoris_dir),
-            ("Custom Optimizers", os.path.join(self.derrian_dir, "custom_scheduler")),
-            ("Kohya SD Scripts", self.sd_scripts_dir),
-        ]:
-            if os.path.exists(os.path.join(path, "setup.py")):
-                cmd = [self.python_cmd, "-m", "pip", "install", "-e", "."]
-                self.run_command(cmd, f"Editable install: {name}", cwd=path, allow_failure=True)
+        """Install the vendored packages in editable mode.
+
+        Runs after install_pytorch_cuda121, so the constraints pin the final
+        torch build. All packages go in together in one pip run; if that fails
+        they are retried one at a time (sequentially: every install writes the
+        same site-packages .pth files and __editable__ finders) so a single bad
+        package cannot block the others.
+        """
+        packages = self.editable_packages()
+        if not packages:
+            return
+        if not self.skip_install:
+            self.constraints_file = self.write_installed_constraints()
+        if self.run_command(self.build_editable_plan(), "Editable installs: vendored packages"):
+            return
+        cmd = self.package_manager["install_cmd"] + self.editable_install_flags() + ["-e", "."]
+        for name, path in packages:
+            self.run_command(cmd, f"Editable install: {name}", cwd=path, allow_failure=True)
+
+    def run_preflight_checks(self):
+        """Run the independent environment probes concurrently, then report in a fixed order.
+
+        The GPU probe can stall on a wedged driver, so it overlaps the filesystem
+        checks; its result is cached for install_pytorch_cuda121.
+        """
+        self.logger.info("Running preflight checks")
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            backend = pool.submit(self._scan_backend)
+            aria2c = pool.submit(shutil.which, "aria2c")
+            gpu = pool.submit(self.has_nvidia_gpu)
+        if not self.verify_vendored_backend(backend.result()):
+            return False
+        self.check_aria2c(aria2c.result())
+        self.logger.info("NVIDIA GPU detected: %s", gpu.result())
+        return True
 
     # =============== NEW FRONTEND METHODS ===============
     def install_frontend_deps(self):
         """Install frontend dependencies if node_modules is missing."""
-        frontend_dir = os.path.join(self.project_root, "frontend")
-        if not os.path.exists(frontend_dir):
+        frontend_dir = self.project_root / "frontend"
+        if not frontend_dir.exists():
             self.logger.info("Frontend directory not found. Skipping.")
             return True
 
@@ -200,8 +521,8 @@ class LocalLinuxInstaller:
             self.logger.warning("Could not determine Node.js version: %s. Frontend setup skipped.", node_err)
             return False
 
-        node_modules = os.path.join(frontend_dir, "node_modules")
-        if not os.path.exists(node_modules):
+        node_modules = frontend_dir / "node_modules"
+        if not node_modules.exists():
             print(" 📦 Installing frontend (Next.js) dependencies...")
             success = self.run_command(["npm", "install"], "Installing frontend dependencies", cwd=frontend_dir)
             return success
@@ -211,13 +532,13 @@ class LocalLinuxInstaller:
 
     def build_frontend(self):
         """Build Next.js app if .next/ is missing."""
-        frontend_dir = os.path.join(self.project_root, "frontend")
-        if not os.path.exists(frontend_dir):
+        frontend_dir = self.project_root / "frontend"
+        if not frontend_dir.exists():
             self.logger.info("Frontend directory not found. Skipping build.")
             return True
 
-        build_dir = os.path.join(frontend_dir, ".next")
-        if not os.path.exists(build_dir):
+        build_dir = frontend_dir / ".next"
+        if not build_dir.exists():
             print(" 🏗️ Building Next.js production frontend...")
             success = self.run_command(["npm", "run", "build"], "Building Next.js app", cwd=frontend_dir)
             if not success:
@@ -231,7 +552,7 @@ class LocalLinuxInstaller:
 
     def check_already_installed(self):
         """Check if a previous installation exists. Returns True if we should proceed."""
-        if not os.path.exists(self.install_marker):
+        if not self.install_marker.exists():
             return True
 
         try:
@@ -274,9 +595,8 @@ class LocalLinuxInstaller:
         if not self.check_already_installed():
             return True
 
-        if not self.verify_vendored_backend():
+        if not self.run_preflight_checks():
             return False
-        self.check_aria2c()
         if not self.install_dependencies():
             return False
         self.install_pytorch_cuda121()
@@ -7,19 +7,61 @@ Enhanced with comprehensive logging and platform-specific fixes
 
 import argparse
 import datetime
+import functools
+import hashlib
+import importlib.metadata
+import json
 import logging
 import os
 import platform
 import shutil
 import subprocess
 import sys
+import sysconfig
+import tarfile
+import tempfile
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
+PYTORCH_CUDA_INDEX = "https://download.pytorch.org/whl/cu121"
+PYTORCH_CUDA_REQUIREMENTS = ["torch==2.4.0+cu121", "torchvision==0.19.0+cu121"]
 
+# The vendored packages' runtime deps all come from requirements_cloud.txt (which
+# also carries setuptools and wheel), so skip re-resolving them and building a
+# throwaway isolated env for each editable install.
+EDITABLE_INSTALL_FLAGS = ["--no-deps", "--no-build-isolation"]
+
+# Snapshots of site-packages after a successful requirements install, keyed by
+# _requirements_fingerprint(). Opt-in: set KTISEOS_ENV_CACHE_DIR (e.g. a
+# persistent volume) so restarted containers can skip pip entirely. Unset means
+# no snapshot, since archiving site-packages costs gigabytes and minutes.
+ENV_CACHE_DIR = os.environ.get("KTISEOS_ENV_CACHE_DIR") or None
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name):
+    """shutil.which, memoized — PATH doesn't change mid-install except where we
+    install a tool ourselves, and those call sites clear the cache."""
+    return shutil.which(name)
+
+
+def _file_sha256(path):
+    """SHA-256 of a file's bytes; hashlib.file_digest where available (3.11+)."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+@functools.cache
 def get_python_command():
     """Detects the best available Python command."""
     for cmd in ["python3", "python"]:
-        if shutil.which(cmd):
+        if _which(cmd):
             try:
                 result = subprocess.run([cmd, "--version"], capture_output=True, text=True, check=True)
                 if result.returncode == 0 and "Python 3" in result.stdout:
@@ -29,6 +71,66 @@ def get_python_command():
     raise RuntimeError("Python 3.10+ not found. Please install Python 3.10+")
 
 
+@functools.cache
+def _detect_package_manager(python_cmd):
+    """
+    Prefer uv for remote (Linux) installs; fall back to pip.
+
+    uv installs are faster and cached, cutting GPU-rental time burned on the
+    provisioning cascade. Remote/Linux only as a conservative default —
+    local stays on the known-good pip path. uv on local is unverified (not
+    forbidden): an old-notebook-era report of *something* triggering a Rust
+    source build on Windows was never root-caused (numpy? safetensors? uv
+    itself? unknown), so we don't switch local installs onto uv on a hunch.
+    uv reads our existing requirements_*.txt unchanged; --index-strategy
+    unsafe-best-match resolves torch-coupled deps (e.g. torchao) against the
+    already-installed torch. Any bootstrap failure silently returns pip, so
+    provisioning can never be worse off.
+
+    Cached per interpreter: the uv bootstrap is a pip subprocess, so it runs
+    once per process however many installers are constructed.
+    """
+    logger = logging.getLogger("installer")
+    pip_pm = {"name": "pip", "install_cmd": [python_cmd, "-m", "pip", "install"], "available": True}
+
+    if platform.system() != "Linux":
+        logger.info("Non-Linux platform — using pip for package installation")
+        return pip_pm
+
+    try:
+        subprocess.run(
+            [python_cmd, "-m", "pip", "install", "-U", "uv"],
+            check=True, capture_output=True, text=True, timeout=300,
+        )
+    except (subprocess.SubprocessError, OSError) as exc:
+        logger.warning("uv bootstrap failed (%s) — using pip", exc)
+        return pip_pm
+
+    # Resolve a runnable uv: module form first, then a PATH binary.
+    uv_invocation = None
+    for candidate in ([python_cmd, "-m", "uv"], ["uv"]):
+        try:
+            subprocess.run(candidate + ["--version"], check=True, capture_output=True, text=True, timeout=60)
+            uv_invocation = candidate
+            break
+        except (subprocess.SubprocessError, OSError):
+            continue
+
+    if uv_invocation is None:
+        logger.warning("uv not runnable after bootstrap — using pip")
+        return pip_pm
+
+    logger.info("Using uv for package installation (remote)")
+    return {
+        "name": "uv",
+        "install_cmd": uv_invocation + [
+            "pip", "install", "--python", python_cmd,
+            "--index-strategy", "unsafe-best-match",
+        ],
+        "available": True,
+    }
+
+
 class RemoteInstaller:
     """Unified Installer for Ecosystem Backend Dependencies"""
 
@@ -56,6 +158,13 @@ class RemoteInstaller:
         self.sd_scripts_dir = os.path.join(self.derrian_dir, "sd_scripts")
         self.lycoris_dir = os.path.join(self.derrian_dir, "lycoris")
 
+        # Set by ensure_pytorch_installed when torch should ride along with the
+        # requirements install instead of getting its own pip run.
+        self.pytorch_pending = False
+        # Installed torch version, recorded by ensure_pytorch_installed so later
+        # steps never import torch again just to read it.
+        self._torch_version = None
+
     def setup_logging(self):
         """Setup comprehensive logging system"""
         # Create logs directory
@@ -95,71 +204,30 @@ class RemoteInstaller:
         self.logger.info("Verbose mode: %s", "Enabled" if self.verbose else "Disabled")
 
     def detect_package_manager(self):
-        """
-        Prefer uv for remote (Linux) installs; fall back to pip.
-
-        uv installs are faster and cached, cutting GPU-rental time burned on the
-        provisioning cascade. Remote/Linux only as a conservative default —
-        local stays on the known-good pip path. uv on local is unverified (not
-        forbidden): an old-notebook-era report of *something* triggering a Rust
-        source build on Windows was never root-caused (numpy? safetensors? uv
-        itself? unknown), so we don't switch local installs onto uv on a hunch.
-        uv reads our existing requirements_*.txt unchanged; --index-strategy
-        unsafe-best-match resolves torch-coupled deps (e.g. torchao) against the
-        already-installed torch. Any bootstrap failure silently returns pip, so
-        provisioning can never be worse off.
-        """
-        pip_pm = {"name": "pip", "install_cmd": [self.python_cmd, "-m", "pip", "install"], "available": True}
-
-        if platform.system() != "Linux":
-            self.logger.info("Non-Linux platform — using pip for package installation")
-            return pip_pm
-
-        try:
-            subprocess.run(
-                [self.python_cmd, "-m", "pip", "install", "-U", "uv"],
-                check=True, capture_output=True, text=True, timeout=300,
-            )
-        except (subprocess.SubprocessError, OSError) as exc:
-            self.logger.warning("uv bootstrap failed (%s) — using pip", exc)
-            return pip_pm
-
-        # Resolve a runnable uv: module form first, then a PATH binary.
-        uv_invocation = None
-        for candidate in ([self.python_cmd, "-m", "uv"], ["uv"]):
-            try:
-                subprocess.run(candidate + ["--version"], check=True, capture_output=True, text=True, timeout=60)
-                uv_invocation = candidate
-                break
-            except (subprocess.SubprocessError, OSError):
-                continue
-
-        if uv_invocation is None:
-            self.logger.warning("uv not runnable after bootstrap — using pip")
-            return pip_pm
-
-        self.logger.info("Using uv for package installation (remote)")
-        return {
-            "name": "uv",
-            "install_cmd": uv_invocation + [
-                "pip", "install", "--python", self.python_cmd,
-                "--index-strategy", "unsafe-best-match",
-            ],
-            "available": True,
-        }
+        """Prefer uv for remote (Linux) installs; fall back to pip. See _detect_package_manager."""
+        return _detect_package_manager(self.python_cmd)
 
     def get_install_command(self, *args):
         """Get package installation command with current package manager"""
         return self.package_manager["install_cmd"] + list(args)
 
     def ensure_pytorch_installed(self):
-        """Install PyTorch with CUDA 12.1 (for remote GPU containers)"""
-        try:
-            import torch  # pyright: ignore[reportMissingImports]
+        """Install PyTorch with CUDA 12.1 (for remote GPU containers)
 
-            self.logger.info("PyTorch already installed: %s", torch.__version__)
+        Unless dependency installation is skipped, a missing torch is not installed
+        here but folded into install_dependencies' single resolver pass.
+        """
+        # Read the wheel metadata instead of importing torch, which would load
+        # the whole CUDA runtime just to report a version string.
+        try:
+            self._torch_version = importlib.metadata.version("torch")
+            self.logger.info("PyTorch already installed: %s", self._torch_version)
             return
-        except ImportError:
+        except importlib.metadata.PackageNotFoundError:
+            if not self.skip_install:
+                self.logger.info("PyTorch not found. It will be installed with CUDA 12.1 alongside the dependencies.")
+                self.pytorch_pending = True
+                return
             self.logger.info("PyTorch not found. Installing with CUDA 12.1...")
             # Use standard CUDA 12.1 (most compatible)
             cmd = [
@@ -170,7 +238,7 @@ class RemoteInstaller:
                 "torch==2.4.0",
                 "torchvision==0.19.0",
                 "--index-url",
-                "https://download.pytorch.org/whl/cu121",
+                PYTORCH_CUDA_INDEX,
             ]
             self.run_command(cmd, "Installing PyTorch with CUDA 12.1")
 
@@ -187,9 +255,15 @@ class RemoteInstaller:
             "",
         ]
 
-        for line in banner_lines:
-            print(line)
-            self.logger.info(line.replace("Log File: ", ""))
+        banner = "\n".join(banner_lines)
+        print(banner)
+        self.logger.info(banner.replace("Log File: ", ""))
+
+    def notify(self, msg, *args, level=logging.INFO):
+        """Format msg once and send it to both the log and the console."""
+        formatted = msg % args if args else msg
+        self.logger.log(level, "%s", formatted)
+        print(formatted)
 
     def run_command(self, command, description, cwd=None, allow_failure=False):
         """Enhanced command runner with comprehensive logging"""
@@ -210,16 +284,25 @@ class RemoteInstaller:
             # Run command with real-time output if verbose
             if self.verbose:
                 process = subprocess.Popen(
-                    command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, cwd=cwd, env=env
+                    command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=-1, cwd=cwd, env=env
                 )
 
+                # Read up to 64 KiB at a time and split lines ourselves: pip emits
+                # thousands of progress lines and per-line readline() calls
+                # dominate CPU. read1() returns whatever is available instead of
+                # waiting for a full block, so output stays live. The trailing
+                # partial line carries to the next block.
                 output_lines = []
-                for line in iter(process.stdout.readline, ""):
-                    line = line.rstrip()
-                    if line:
-                        print(f"   {line}")
-                        self.logger.debug("OUTPUT: %s", line)
-                        output_lines.append(line)
+                tail = b""
+                while True:
+                    data = process.stdout.read1(65536)
+                    if not data:
+                        break
+                    chunk = tail + data
+                    lines = chunk.splitlines()
+                    tail = lines.pop() if lines and not chunk.endswith((b"\n", b"\r")) else b""
+                    self._emit_output_lines(lines, output_lines)
+                self._emit_output_lines([tail], output_lines)
 
                 process.stdout.close()
                 return_code = process.wait()
@@ -266,10 +349,17 @@ class RemoteInstaller:
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             error_msg = f" Unexpected error during %s: {e}" % description
-            self.logger.error(error_msg)
-            print(error_msg)
+            self.notify(error_msg, level=logging.ERROR)
             return False
 
+    def _emit_output_lines(self, raw_lines, output_lines):
+        for raw in raw_lines:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if line:
+                print(f"   {line}")
+                self.logger.debug("OUTPUT: %s", line)
+                output_lines.append(line)
+
     def verify_vendored_backend(self):
         """Verify vendored backend directory exists and has required components"""
         print("Verifying vendored backend...")
@@ -282,8 +372,7 @@ class RemoteInstaller:
                 "   This repository should include trainer/derrian_backend in the clone.\n"
                 "   If you cloned this repo, the vendored backend should already be present."
             )
-            self.logger.error(error_msg)
-            print(error_msg)
+            self.notify(error_msg, level=logging.ERROR)
             return False
 
         # Verify key subdirectories exist
@@ -295,8 +384,7 @@ class RemoteInstaller:
         for name, path in required_dirs.items():
             if not os.path.exists(path):
                 error_msg = "Required directory '%s' not found at %s" % (name, path)
-                self.logger.error(error_msg)
-                print(error_msg)
+                self.notify(error_msg, level=logging.ERROR)
                 return False
             self.logger.info("   Found %s at %s", name, path)
             print(f"   {name} directory verified")
@@ -319,33 +407,209 @@ class RemoteInstaller:
             requirements_file = os.path.join(self.project_root, "requirements.txt")
             if not os.path.exists(requirements_file):
                 error_msg = "CRITICAL: No requirements file found!"
-                self.logger.error(error_msg)
-                print(error_msg)
+                self.notify(error_msg, level=logging.ERROR)
                 return False
             self.logger.warning("requirements_cloud.txt not found, falling back to requirements.txt")
 
         self.logger.info("Installing cloud dependencies from: %s", requirements_file)
 
-        install_cmd = self.get_install_command("-r", requirements_file)
-        success = self.run_command(install_cmd, f"Installing Python packages with {self.package_manager['name']}")
+        if ENV_CACHE_DIR:
+            env_roots = self._env_cache_roots()
+            before = {key: self._snapshot_site_packages(path) for key, path in env_roots.items()}
+            fingerprint = self._requirements_fingerprint(requirements_file, env_roots, before)
+            if self._restore_env_cache(fingerprint, env_roots):
+                self.pytorch_pending = False
+                self.verify_onnx_runtime()
+                return True
 
-        # If uv hits a flag/resolver quirk, don't brick the deploy — retry the
-        # same requirements with pip before giving up.
-        if not success and self.package_manager["name"] == "uv":
-            self.logger.warning("uv install failed — retrying with pip")
-            print("   uv install failed — retrying with pip...")
-            pip_cmd = [self.python_cmd, "-m", "pip", "install", "-r", requirements_file]
-            success = self.run_command(pip_cmd, "Installing Python packages with pip (fallback)")
+        unified_file = self._build_unified_requirements(requirements_file)
+        try:
+            install_cmd = self.get_install_command("-r", unified_file)
+            success = self.run_command(install_cmd, f"Installing Python packages with {self.package_manager['name']}")
+
+            # If uv hits a flag/resolver quirk, don't brick the deploy — retry the
+            # same requirements with pip before giving up.
+            if not success and self.package_manager["name"] == "uv":
+                self.notify("   uv install failed — retrying with pip...", level=logging.WARNING)
+                pip_cmd = [self.python_cmd, "-m", "pip", "install", "-r", unified_file]
+                success = self.run_command(pip_cmd, "Installing Python packages with pip (fallback)")
+        finally:
+            os.remove(unified_file)
 
         if success:
+            self.pytorch_pending = False
+            if ENV_CACHE_DIR:
+                self._save_env_cache(fingerprint, env_roots, before)
             self.verify_onnx_runtime()
 
         return success
 
+    def _build_unified_requirements(self, requirements_file):
+        """Write a temp requirements file that pulls in requirements_file plus the
+        CUDA PyTorch pins when ensure_pytorch_installed deferred them, so one
+        resolver pass covers the whole graph.
+
+        The +cu121 local versions keep the CUDA build even though the PyTorch index
+        is only an --extra-index-url here (a file-level --index-url would hide PyPI
+        from every other requirement).
+        """
+        lines = [f"-r {os.path.basename(requirements_file)}"]
+        if self.pytorch_pending:
+            lines = [f"--extra-index-url {PYTORCH_CUDA_INDEX}", *PYTORCH_CUDA_REQUIREMENTS, *lines]
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", suffix=".txt", prefix=".unified_",
+            dir=os.path.dirname(requirements_file), delete=False,
+        ) as f:
+            f.write("\n".join(lines) + "\n")
+        return f.name
+
+    def _requirements_fingerprint(self, requirements_file, env_roots, before):
+        """Key for the environment cache.
+
+        Covers the requirements file (and its -r includes), the interpreter, the installed torch build
+        (its local version carries the CUDA tag), the platform, the cached
+        directories' paths (console scripts hardcode the interpreter path) and the
+        names already in them — so a snapshot is only ever restored on top of the
+        same base image it was taken from.
+        """
+        digest = hashlib.sha256()
+        # Follow -r includes: requirements_cloud.txt pulls in requirements_base.txt.
+        pending = [requirements_file]
+        while pending:
+            path = pending.pop()
+            digest.update(_file_sha256(path).encode("ascii"))
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2 and parts[0] in ("-r", "--requirement"):
+                        pending.append(os.path.join(os.path.dirname(path), parts[1]))
+        torch_version = self._torch_version
+        if torch_version is None:
+            try:
+                torch_version = importlib.metadata.version("torch")
+            except importlib.metadata.PackageNotFoundError:
+                torch_version = "none"
+        names = sorted(f"{key}:{path}" for key, path in env_roots.items())
+        names += sorted(f"{key}/{name}" for key, snapshot in before.items() for name in snapshot)
+        for part in (sys.version, torch_version, platform.platform(), *names):
+            digest.update(b"\0" + part.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _env_cache_roots():
+        """Directories an install writes to: purelib, platlib (lib64 distros) and
+        the scripts dir holding console entry points. Duplicates are dropped."""
+        paths = sysconfig.get_paths()
+        roots = {}
+        for key in ("purelib", "platlib", "scripts"):
+            path = os.path.normpath(paths[key])
+            if path not in roots.values() and os.path.isdir(path):
+                roots[key] = path
+        return roots
+
+    def _cache_key_path(self, fingerprint, key):
+        return os.path.join(ENV_CACHE_DIR, f"{fingerprint}.{key}.tar.gz")
+
+    def _cache_removed_path(self, fingerprint):
+        return os.path.join(ENV_CACHE_DIR, f"{fingerprint}.removed.json")
+
+    @staticmethod
+    def _snapshot_site_packages(site_packages):
+        """Map each top-level entry of a directory to a signature of its whole subtree.
+
+        The signature covers every file's relative path, size and mtime, so an
+        upgrade deep inside a shared namespace directory (nvidia/cublas/...,
+        google/...) still marks nvidia/ or google/ as changed.
+        """
+        snapshot = {}
+        with os.scandir(site_packages) as it:
+            for entry in it:
+                st = entry.stat(follow_symlinks=False)
+                digest = hashlib.sha256(f"{st.st_mtime_ns}:{st.st_size}".encode("ascii"))
+                if entry.is_dir(follow_symlinks=False):
+                    for root, dirs, files in os.walk(entry.path):
+                        dirs.sort()
+                        for name in sorted(files):
+                            path = os.path.join(root, name)
+                            fst = os.lstat(path)
+                            rel = os.path.relpath(path, entry.path)
+                            line = f"{rel}\0{fst.st_size}\0{fst.st_mtime_ns}\n"
+                            digest.update(line.encode("utf-8", "surrogateescape"))
+                snapshot[entry.name] = digest.hexdigest()
+        return snapshot
+
+    @staticmethod
+    def _remove_site_entry(site_packages, name):
+        path = os.path.join(site_packages, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+
+    def _restore_env_cache(self, fingerprint, env_roots):
+        """Extract a cached snapshot into each cached directory. Returns True on a cache hit."""
+        archives = {key: self._cache_key_path(fingerprint, key) for key in env_roots}
+        removed_file = self._cache_removed_path(fingerprint)
+        if not all(os.path.exists(path) for path in [removed_file, *archives.values()]):
+            self.logger.info("Environment cache miss: %s", fingerprint[:12])
+            return False
+        # The cache location comes from an env var, so only extract with the
+        # "data" filter (no absolute paths, no links escaping the target, no
+        # setuid bits). Pythons without it get a normal pip install instead.
+        if not hasattr(tarfile, "data_filter"):
+            self.logger.warning("tarfile data filter unavailable on this Python, not restoring environment cache")
+            return False
+
+        print(f"Restoring cached Python environment ({fingerprint[:12]})...")
+        try:
+            with open(removed_file, "r", encoding="utf-8") as f:
+                removed = json.load(f)
+            for key, root in env_roots.items():
+                for name in removed.get(key, []):
+                    self._remove_site_entry(root, name)
+                with tarfile.open(archives[key], "r:gz") as tar:
+                    # Each archived top-level entry replaces the current one wholesale,
+                    # so files from the previously installed version can't linger.
+                    for name in {member.name.split("/", 1)[0] for member in tar.getmembers()}:
+                        self._remove_site_entry(root, name)
+                    tar.extractall(root, filter="data")
+        except (OSError, ValueError, tarfile.TarError) as exc:
+            self.logger.warning("Environment cache restore failed (%s) — falling back to pip", exc)
+            print("   Cached environment unusable — installing with pip instead.")
+            return False
+
+        self.logger.info("Restored Python environment from cache: %s", fingerprint[:12])
+        print("Cached Python environment restored — skipping pip.")
+        return True
+
+    def _save_env_cache(self, fingerprint, env_roots, before):
+        """Archive the entries the install added or replaced in each cached directory. Non-fatal."""
+        try:
+            os.makedirs(ENV_CACHE_DIR, exist_ok=True)
+            removed = {}
+            total = 0
+            for key, root in env_roots.items():
+                after = self._snapshot_site_packages(root)
+                changed = [name for name, signature in after.items() if before[key].get(name) != signature]
+                removed[key] = [name for name in before[key] if name not in after]
+                archive = self._cache_key_path(fingerprint, key)
+                # Write under a temporary name so an interrupted save never looks like a hit.
+                partial = archive + ".partial"
+                with tarfile.open(partial, "w:gz") as tar:
+                    for name in sorted(changed):
+                        tar.add(os.path.join(root, name), arcname=name)
+                os.replace(partial, archive)
+                total += len(changed)
+            # Written last: restore treats a missing removal list as a miss.
+            with open(self._cache_removed_path(fingerprint), "w", encoding="utf-8") as f:
+                json.dump(removed, f)
+            self.logger.info("Saved environment cache (%d entries): %s", total, fingerprint[:12])
+        except (OSError, tarfile.TarError) as exc:
+            self.logger.warning("Could not save environment cache: %s", exc)
+
     def verify_onnx_runtime(self):
         """Verify ONNX runtime is installed and can see GPU providers."""
-        self.logger.info("Verifying ONNX runtime installation...")
-        print("Verifying ONNX runtime installation...")
+        self.notify("Verifying ONNX runtime installation...")
 
         verify_cmd = [
             self.python_cmd,
@@ -356,11 +620,9 @@ class RemoteInstaller:
         success = self.run_command(verify_cmd, "Verifying ONNX runtime import")
 
         if success:
-            self.logger.info("ONNX runtime verification successful")
-            print("ONNX runtime verification successful")
+            self.notify("ONNX runtime verification successful")
         else:
-            self.logger.error("ONNX runtime verification failed — WD14 tagging may fall back to CPU")
-            print("ONNX runtime verification failed — WD14 tagging may fall back to CPU")
+            self.notify("ONNX runtime verification failed — WD14 tagging may fall back to CPU", level=logging.ERROR)
             print("   If tagging is slow, try: pip install --upgrade onnxruntime-gpu")
 
     def check_system_dependencies(self):
@@ -368,9 +630,8 @@ class RemoteInstaller:
         self.logger.info("Checking system dependencies...")
 
         # Check for aria2c
-        if not shutil.which("aria2c"):
-            self.logger.warning("aria2c not found. Attempting to install...")
-            print("   - aria2c not found. Attempting to install...")
+        if not _which("aria2c"):
+            self.notify("   - aria2c not found. Attempting to install...", level=logging.WARNING)
 
             system = platform.system().lower()
             self.logger.info("Detected system: %s", system)
@@ -385,17 +646,19 @@ class RemoteInstaller:
                 # stdin that never comes in a non-TTY provisioning context.
                 apt_opts = "-o DPkg::Lock::Timeout=300"
                 package_managers = [
-                    (["apt-get", "--version"],
+                    ("apt-get",
                      "%sapt-get %s update && %sapt-get %s install -y aria2" % (sudo_prefix, apt_opts, sudo_prefix, apt_opts)),
-                    (["yum", "--version"], "%syum install -y aria2" % sudo_prefix),
-                    (["dnf", "--version"], "%sdnf install -y aria2" % sudo_prefix),
+                    ("yum", "%syum install -y aria2" % sudo_prefix),
+                    ("dnf", "%sdnf install -y aria2" % sudo_prefix),
                 ]
 
                 apt_env = {**os.environ, "DEBIAN_FRONTEND": "noninteractive"}
-                for pm_cmd, install_cmd in package_managers:
+                for pm_name, install_cmd in package_managers:
+                    # A PATH lookup is enough to find the package manager; no need
+                    # to spawn `<pm> --version` for each candidate.
+                    if not _which(pm_name):
+                        continue
                     try:
-                        subprocess.run(pm_cmd, capture_output=True, check=True)
-                        pm_name = pm_cmd[0]
                         self.logger.info("Found package manager: %s", pm_name)
                         print(f"     Installing with {pm_name}...")
 
@@ -406,6 +669,7 @@ class RemoteInstaller:
                             check=True, env=apt_env, timeout=420,
                         )
                         if result.returncode == 0:
+                            _which.cache_clear()
                             self.logger.info("Successfully installed aria2c with %s", pm_name)
                             print("     Successfully installed aria2c")
                             break
@@ -413,7 +677,7 @@ class RemoteInstaller:
                             self.logger.warning("Failed to install with %s: %s", pm_name, result.stderr)
                     except subprocess.TimeoutExpired:
                         self.logger.warning(
-                            "aria2c install via %s timed out — skipping (optional; downloads fall back)", pm_cmd[0]
+                            "aria2c install via %s timed out — skipping (optional; downloads fall back)", pm_name
                         )
                         print("     aria2c install timed out — skipping (optional)")
                         break
@@ -421,8 +685,7 @@ class RemoteInstaller:
                         continue
                 else:
                     warning_msg = "Could not auto-install aria2c. Please install manually:"
-                    self.logger.warning(warning_msg)
-                    print(f"     {warning_msg}")
+                    self.notify("     %s", warning_msg, level=logging.WARNING)
                     if is_root:
                         print("        Ubuntu/Debian: apt update && apt install -y aria2")
                         print("        CentOS/RHEL: yum install -y aria2")
@@ -432,18 +695,15 @@ class RemoteInstaller:
 
             elif system == "darwin":
                 warning_msg = "macOS: Please install aria2c manually: brew install aria2"
-                self.logger.warning(warning_msg)
-                print(f"     {warning_msg}")
+                self.notify("     %s", warning_msg, level=logging.WARNING)
 
             else:
                 warning_msg = (
                     f"System {system} not officially supported for aria2c auto-install. Please install manually."
                 )
-                self.logger.warning(warning_msg)
-                print(f"     {warning_msg}")
+                self.notify("     %s", warning_msg, level=logging.WARNING)
         else:
-            self.logger.info("aria2c: Found")
-            print("   - aria2c: Found")
+            self.notify("   - aria2c: Found")
 
         return True
 
@@ -455,7 +715,7 @@ class RemoteInstaller:
         Required custom nodes for the bundled workflow templates are installed too.
         All failures are non-fatal — the training tool works without ComfyUI.
         """
-        if not shutil.which("git"):
+        if not _which("git"):
             self.logger.warning("git not found — skipping ComfyUI installation.")
             print("   ⚠️  git not found. Install git to enable ComfyUI auto-install.")
             return False
@@ -465,8 +725,7 @@ class RemoteInstaller:
 
         # Clone or pull ComfyUI
         if os.path.isdir(os.path.join(comfyui_dir, ".git")):
-            self.logger.info("ComfyUI already cloned, pulling updates...")
-            print("   ComfyUI already cloned — pulling updates...")
+            self.notify("   ComfyUI already cloned — pulling updates...")
             self.run_command(
                 ["git", "pull", "--ff-only"],
                 "Updating ComfyUI",
@@ -641,8 +900,7 @@ class RemoteInstaller:
                 self.logger.info("Written extra_model_paths.yaml → ComfyUI can now see output/, pretrained_model/, vae/.")
                 print("   ✅ extra_model_paths.yaml written — trainer models shared with ComfyUI.")
 
-        self.logger.info("ComfyUI installation complete.")
-        print("   ComfyUI installation complete.")
+        self.notify("   ComfyUI installation complete.")
         return True
 
     def _download_comfyui_models(self, models_dir: str) -> None:
@@ -652,8 +910,6 @@ class RemoteInstaller:
         adetailer nodes. Downloads are skipped if the file already exists.
         All failures are non-fatal.
         """
-        import urllib.request
-
         models_to_download = [
             # SAM (Segment Anything) — used by SAMLoader node
             (
@@ -669,22 +925,78 @@ class RemoteInstaller:
             ),
         ]
 
+        missing = []
         for rel_path, url, label in models_to_download:
+            if os.path.exists(os.path.join(models_dir, rel_path)):
+                print(f"   ✅ {label} already present, skipping")
+            else:
+                missing.append((rel_path, url, label))
+
+        # aria2c (set up by check_system_dependencies) fetches every file at once
+        # over segmented connections, straight to disk; urllib covers whatever it
+        # didn't get.
+        if missing and _which("aria2c"):
+            self._aria2c_download(
+                [(url, os.path.join(models_dir, rel_path)) for rel_path, url, _label in missing],
+                "Downloading ComfyUI detection models with aria2c",
+            )
+
+        fallback = []
+        for rel_path, url, label in missing:
             dest = os.path.join(models_dir, rel_path)
+            # aria2c leaves a .aria2 control file beside anything it didn't finish
+            if os.path.exists(dest + ".aria2"):
+                for partial in (dest, dest + ".aria2"):
+                    if os.path.exists(partial):
+                        os.remove(partial)
             if os.path.exists(dest):
-                print(f"   ✅ {label} already present, skipping")
-                continue
-            print(f"   ⬇️  Downloading {label}...")
-            try:
-                urllib.request.urlretrieve(url, dest)
                 print(f"   ✅ {label} downloaded")
                 self.logger.info("Downloaded %s to %s", label, dest)
-            except Exception as exc:
-                print(f"   ⚠️  {label} download failed (non-fatal): {exc}")
-                self.logger.warning("Failed to download %s: %s", label, exc)
+            else:
+                fallback.append((url, dest, label))
+
+        # Fetch the rest concurrently so the files' connection setup and
+        # per-connection bandwidth caps overlap.
+        if fallback:
+            with ThreadPoolExecutor(max_workers=len(fallback)) as pool:
+                for future in [pool.submit(self._urllib_download, *item) for item in fallback]:
+                    future.result()
 
         self._sync_ecosystem_models(models_dir)
 
+    def _urllib_download(self, url, dest, label):
+        """Download url to dest with urllib. Failures are logged, never raised."""
+        print(f"   ⬇️  Downloading {label}...")
+        # Stream to a .part file in 64 KiB chunks and rename on completion, so a
+        # failed download is never mistaken for a present model on the next run.
+        partial = dest + ".part"
+        try:
+            with urllib.request.urlopen(url, timeout=30) as resp, open(partial, "wb") as f:
+                shutil.copyfileobj(resp, f, length=65536)
+            os.replace(partial, dest)
+            print(f"   ✅ {label} downloaded")
+            self.logger.info("Downloaded %s to %s", label, dest)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if os.path.exists(partial):
+                os.remove(partial)
+            print(f"   ⚠️  {label} download failed (non-fatal): {exc}")
+            self.logger.warning("Failed to download %s: %s", label, exc)
+
+    def _aria2c_download(self, downloads, description):
+        """Fetch (url, dest) pairs concurrently with aria2c. Failures are non-fatal."""
+        # aria2c input file: one URI per line, per-download options indented below it.
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".txt", delete=False) as f:
+            for url, dest in downloads:
+                f.write(f"{url}\n  dir={os.path.dirname(dest)}\n  out={os.path.basename(dest)}\n")
+        try:
+            cmd = [
+                "aria2c", "-x", "16", "-s", "16", "-j", str(len(downloads)),
+                "--auto-file-renaming=false", "--console-log-level=warn", "-i", f.name,
+            ]
+            self.run_command(cmd, description, allow_failure=True)
+        finally:
+            os.remove(f.name)
+
     def _sync_ecosystem_models(self, models_dir: str) -> None:
         """Sync the curated Ecosystem-Models repo into ComfyUI/models.
 
@@ -730,6 +1042,7 @@ class RemoteInstaller:
             "Kohya's SD Scripts": self.sd_scripts_dir,
         }
 
+        targets = []
         for name, path in editable_installs.items():
             setup_py = os.path.join(path, "setup.py")
             pyproject_toml = os.path.join(path, "pyproject.toml")
@@ -739,22 +1052,42 @@ class RemoteInstaller:
                 if not os.path.isdir(abs_path):
                     self.logger.warning("Skipping editable install for %s: path not found: %s", name, abs_path)
                     continue
-
-                self.logger.info("Installing %s in editable mode from %s", name, abs_path)
-                install_cmd = self.package_manager["install_cmd"] + ["-e", abs_path]
-                success = self.run_command(install_cmd, f"Editable install for {name}", allow_failure=True)
-
-                if not success:
-                    warning_msg = "Could not install %s in editable mode. Training might still work." % name
-                    self.logger.warning(warning_msg)
-                    print(f"    - {warning_msg}")
+                targets.append((name, abs_path))
             else:
                 self.logger.debug("No setup.py or pyproject.toml found for %s at %s, skipping", name, path)
 
+        # One install call for all of them: every install writes the same
+        # site-packages (.pth files, __editable__ finders), so they must not run
+        # concurrently, and one resolver pass is cheaper than three anyway.
+        if targets:
+            editable_args = []
+            for _, abs_path in targets:
+                editable_args += ["-e", abs_path]
+            names = ", ".join(name for name, _ in targets)
+            self.logger.info("Installing in editable mode: %s", names)
+            install_cmd = self.get_install_command(*EDITABLE_INSTALL_FLAGS, *editable_args)
+            if self.run_command(install_cmd, "Editable installs for vendored packages"):
+                self.logger.info("Editable installs finished: %s", names)
+            else:
+                # Nothing is installed if any target fails; retry one by one (in
+                # sequence) so a single broken package doesn't take the others down.
+                self.logger.warning("Batched editable install failed, retrying packages individually")
+                for name, abs_path in targets:
+                    self._editable_install(name, abs_path)
+
         # --- Platform-Specific Fixes ---
 
         return True
 
+    def _editable_install(self, name, abs_path):
+        self.logger.info("Installing %s in editable mode from %s", name, abs_path)
+        install_cmd = self.get_install_command(*EDITABLE_INSTALL_FLAGS, "-e", abs_path)
+        success = self.run_command(install_cmd, f"Editable install for {name}", allow_failure=True)
+
+        if not success:
+            warning_msg = "Could not install %s in editable mode. Training might still work." % name
+            self.notify("    - %s", warning_msg, level=logging.WARNING)
+
     def check_already_installed(self):
         """Check if a previous installation exists. Returns True if we should proceed."""
         if not os.path.exists(self.install_marker):
@@ -810,14 +1143,12 @@ class RemoteInstaller:
         try:
             if not self.verify_vendored_backend():
                 error_msg = "Halting installation due to vendored backend verification failure."
-                self.logger.error(error_msg)
-                print(f"{error_msg}")
+                self.notify(error_msg, level=logging.ERROR)
                 return False
 
             if not self.install_dependencies():
                 error_msg = "Halting installation due to dependency installation failure."
-                self.logger.error(error_msg)
-                print(f"{error_msg}")
+                self.notify(error_msg, level=logging.ERROR)
                 return False
 
             # aria2c is an optional download accelerator used later for model
@@ -827,8 +1158,7 @@ class RemoteInstaller:
 
             if not self.apply_special_fixes_and_installs():
                 warning_msg = "Some special fixes or editable installs failed."
-                self.logger.warning(warning_msg)
-                print(f"{warning_msg}")
+                self.notify(warning_msg, level=logging.WARNING)
 
             if self.skip_comfyui:
                 self.logger.info("Skipping ComfyUI installation (--no-comfyui).")
@@ -855,18 +1185,16 @@ class RemoteInstaller:
                 "=" * 70,
             ]
 
-            for line in completion_lines:
-                print(line)
-                if line.strip():
-                    self.logger.info(line)
+            completion = "\n".join(completion_lines)
+            print(completion)
+            self.logger.info(completion.strip())
 
             self.write_install_marker()
             return True
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             error_msg = f"Unexpected error during installation: {e}"
-            self.logger.error(error_msg)
-            print(f"{error_msg}")
+            self.notify(error_msg, level=logging.ERROR)
             print(f"Check log file for details: {self.log_file}")
             return False
 
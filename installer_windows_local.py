@@ -11,18 +11,35 @@ Automatically installs PyTorch with CUDA 12.1 support (detects and replaces CPU-
 """
 
 import argparse
+import asyncio
+import atexit
 import datetime
+import functools
+import hashlib
+import importlib.metadata
+import json
 import logging
+import logging.handlers
 import os
 import platform
+import queue
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
 
-# Windows-specific: Ensure Colorama for colored console output
-if sys.platform == "win32":
+
+def _ensure_colorama():
+    """Windows-specific: Ensure Colorama for colored console output.
+
+    Called when an installation actually starts, so --help never pays for the
+    import (or a pip install of it). Skipped when output isn't a console or
+    NO_COLOR is set.
+    """
+    if sys.platform != "win32" or os.environ.get("NO_COLOR") or not sys.stdout.isatty():
+        return
     try:
         import colorama
     except ImportError:
@@ -32,6 +49,139 @@ if sys.platform == "win32":
     colorama.init(autoreset=True)
 
 
+# setuptools and wheel come from requirements_windows.txt, which is installed
+# first, so build the vendored packages against it instead of bootstrapping a
+# throwaway isolated build env for each one.
+EDITABLE_INSTALL_FLAGS = ["--no-build-isolation"]
+
+# Project-local pip cache for the editable installs, so the wheels their
+# dependencies resolve to survive re-runs and a wiped user cache.
+PIP_CACHE_DIRNAME = ".pip-cache"
+
+# Fixed environment for `npm run build`: no telemetry call-home, no interactive
+# prompts, production mode.
+NEXT_BUILD_ENV = {"NEXT_TELEMETRY_DISABLED": "1", "CI": "1", "NODE_ENV": "production"}
+
+# Opt-in local wheelhouse (set KTISEOS_WHEELHOUSE=1): after a successful install,
+# keep wheels of the exact installed versions in wheels/ so reinstalls into a
+# fresh venv work offline. Off by default since it duplicates site-packages on disk.
+WHEELHOUSE_ENABLED = bool(os.environ.get("KTISEOS_WHEELHOUSE"))
+
+# Opt-in pip fast-deps (set KTISEOS_PIP_FAST_DEPS=1): resolve from wheel
+# metadata fetched with HTTP range requests. Still experimental in pip, which
+# prints a "not ready for production" warning on every call, so off by default.
+PIP_FAST_DEPS = bool(os.environ.get("KTISEOS_PIP_FAST_DEPS"))
+
+# Never frozen into the wheelhouse: install_pytorch owns the CUDA build, and a
+# plain freeze pin would let pip pick a different (CPU) wheel for it.
+WHEELHOUSE_EXCLUDE = frozenset({"torch", "torchvision", "torchaudio"})
+
+
+# Resolved tool paths persisted across runs; delete it after moving a tool.
+TOOL_PATHS_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", ".tool_paths.json")
+_tool_paths_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _tool_paths():
+    try:
+        with open(TOOL_PATHS_MANIFEST, "r", encoding="utf-8") as f:
+            paths = json.load(f)
+        return paths if isinstance(paths, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name):
+    """shutil.which, memoized — PATH walks can hit slow network drives on Windows.
+
+    Hits are also recorded in TOOL_PATHS_MANIFEST, so later runs reuse a path
+    that still exists without walking PATH at all. Misses are never recorded.
+    """
+    with _tool_paths_lock:
+        paths = _tool_paths()
+        cached = paths.get(name)
+        if cached and os.path.isfile(cached):
+            return cached
+        path = shutil.which(name)
+        if path:
+            paths[name] = path
+            try:
+                os.makedirs(os.path.dirname(TOOL_PATHS_MANIFEST), exist_ok=True)
+                with open(TOOL_PATHS_MANIFEST, "w", encoding="utf-8") as f:
+                    json.dump(paths, f, indent=2)
+            except OSError:
+                pass
+        return path
+
+
+@functools.lru_cache(maxsize=None)
+def _exists(path):
+    """os.path.exists, memoized. Only for paths the installer never creates or
+    removes itself (vendored sources, requirements, Node install spots)."""
+    return os.path.exists(path)
+
+
+def _files_sha256(paths, *extra):
+    """SHA-256 over the given files (missing ones are skipped) plus extra strings."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            file_digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                # hashlib.file_digest is 3.11+; plain chunked reads work on 3.10
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    file_digest.update(chunk)
+            digest.update(file_digest.digest())
+    for part in extra:
+        digest.update(b"\0" + part.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _wait_for_key(timeout):
+    """Return the first key pressed within timeout seconds, or None.
+
+    Polls msvcrt every 200 ms, so it returns as soon as a key is hit. Returns
+    immediately when stdin isn't an interactive Windows console (piped, CI).
+    """
+    if sys.platform != "win32" or not sys.stdin.isatty():
+        return None
+    import msvcrt
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if msvcrt.kbhit():
+            return msvcrt.getwch()
+        time.sleep(0.2)
+    return None
+
+
+def _dir_has_entries(path):
+    """True if path is a directory with at least one entry (stops at the first)."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except OSError:
+        return False
+
+
+def _read_stamp(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_stamp(path, value):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(value)
+    except OSError:
+        pass
+
+
 class LocalWindowsInstaller:
     """Local Windows Installer for Ecosystem Backend + Frontend Dependencies"""
 
@@ -50,14 +200,15 @@ class LocalWindowsInstaller:
         self.force = force
         self.skip_comfyui = skip_comfyui
         self.install_marker = os.path.join(self.project_root, "install_complete.marker")
+        self.pip_cache_dir = os.path.join(self.project_root, PIP_CACHE_DIRNAME)
+        # Backend and frontend pipelines print from worker threads concurrently
+        self._console_lock = threading.Lock()
 
         self.setup_logging()
         self.python_cmd = sys.executable
-        self.package_manager = {
-            "name": "pip",
-            "install_cmd": [self.python_cmd, "-m", "pip", "install"],
-            "available": True,
-        }
+        self.package_manager = self._pick_installer()
+        self._torch_info = None
+        self._npm_exe = None
 
         self.trainer_dir = os.path.join(self.project_root, "trainer")
         self.derrian_dir = os.path.join(self.trainer_dir, "derrian_backend")
@@ -79,12 +230,35 @@ class LocalWindowsInstaller:
         console_handler.setFormatter(formatter)
         self.logger = logging.getLogger("local_windows_installer")
         self.logger.setLevel(logging.DEBUG)
-        self.logger.addHandler(file_handler)
+        # File writes happen on the listener thread so verbose per-line OUTPUT
+        # records don't block the command loop on disk (or antivirus) latency.
+        log_queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
         self.logger.addHandler(console_handler)
         self.log_file = log_file
         self.logger.info("Local Windows Installer logging started - Log file: %s", log_file)
         self.logger.info("Verbose mode: %s", "Enabled" if self.verbose else "Disabled")
 
+    def _pick_installer(self):
+        """Return the pip invocation to install with, using the fastest mode it supports.
+
+        Local Windows installs stay on pip rather than uv (see the remote
+        installer's detect_package_manager for why). With KTISEOS_PIP_FAST_DEPS set,
+        pip 25+ also gets fast-deps (see PIP_FAST_DEPS).
+        """
+        install_cmd = [self.python_cmd, "-m", "pip", "install"]
+        try:
+            pip_version = tuple(int(part) for part in importlib.metadata.version("pip").split(".")[:2])
+        except (importlib.metadata.PackageNotFoundError, ValueError):
+            pip_version = (0, 0)
+        if PIP_FAST_DEPS and pip_version >= (25, 0):
+            install_cmd.append("--use-feature=fast-deps")
+        self.logger.info("Using pip %s for package installation", ".".join(map(str, pip_version)))
+        return {"name": "pip", "install_cmd": install_cmd, "available": True, "version": pip_version}
+
     def print_banner(self):
         banner_lines = [
             "=" * 70,
@@ -97,36 +271,34 @@ class LocalWindowsInstaller:
             f"Log File: {self.log_file}",
             "",
         ]
-        for line in banner_lines:
-            print(line)
-            self.logger.info(line)
+        banner = "\n".join(banner_lines)
+        self._print(banner)
+        self.logger.info(banner)
 
-    def run_command(self, command, description, cwd=None, allow_failure=False):
+    def _print(self, message):
+        with self._console_lock:
+            print(message)
+
+    def run_command(self, command, description, cwd=None, allow_failure=False, env=None):
         self.logger.info(" %s...", description)
         self.logger.debug("Command: %s", " ".join(command))
         self.logger.debug("Working directory: %s", cwd or "current")
 
         if not self.verbose:
-            print(f" {description}...")
+            self._print(f" {description}...")
 
         if cwd is not None:
             if not re.match(r'^[a-zA-Z0-9_\-./\\]+$', cwd):
                 raise ValueError(f"Invalid cwd parameter: {cwd}")
 
-        # On Windows, use shell=True to support .cmd/.bat files (like npm.cmd)
-        use_shell = platform.system() == "Windows"
+        # Only batch scripts (npm.cmd) need cmd.exe; python.exe, git.exe etc. are
+        # launched directly, skipping a cmd.exe process and the quoting pass.
+        use_shell = self._needs_shell(command)
         if use_shell:
-            # Convert list to string for shell execution on Windows
-            # Quote paths with spaces (like "C:\Program Files\nodejs\npm.CMD")
-            quoted_command = []
-            for part in command:
-                part_str = str(part)
-                # Quote if contains spaces and not already quoted
-                if " " in part_str and not (part_str.startswith('"') and part_str.endswith('"')):
-                    quoted_command.append(f'"{part_str}"')
-                else:
-                    quoted_command.append(part_str)
-            shell_command = " ".join(quoted_command)
+            # Convert list to string for shell execution on Windows, quoting paths
+            # with spaces (like "C:\Program Files\nodejs\npm.CMD") the same way
+            # subprocess does for list arguments.
+            shell_command = subprocess.list2cmdline([str(part) for part in command])
             # On Windows, subprocess.run(shell=True, cwd=...) can raise
             # "Invalid cwd parameter" for paths on non-C: drives (e.g. I:\...).
             # Work around this by embedding "cd /d" at the front of the command
@@ -139,46 +311,33 @@ class LocalWindowsInstaller:
 
         try:
             if self.verbose:
-                process = subprocess.Popen(
-                    shell_command if use_shell else command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    cwd=cwd,
-                    encoding="utf-8",
-                    errors="replace",
-                    shell=use_shell,
+                return_code, output = asyncio.run(
+                    self._stream_command_async(shell_command if use_shell else command, use_shell, cwd, env)
                 )
-                output_lines = []
-                for line in iter(process.stdout.readline, ""):
-                    line = line.rstrip()
-                    if line:
-                        print(f"   {line}")
-                        self.logger.debug("OUTPUT: %s", line)
-                        output_lines.append(line)
-                process.stdout.close()
-                return_code = process.wait()
-                output = "\n".join(output_lines)
                 if return_code != 0:
                     raise subprocess.CalledProcessError(return_code, command, output)
             else:
-                result = subprocess.run(
+                # pip/npm stdout is progress chatter; only stderr matters on
+                # failure, so don't buffer megabytes of it.
+                subprocess.run(
                     shell_command if use_shell else command,
                     check=True,
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     cwd=cwd,
                     encoding="utf-8",
                     errors="replace",
                     shell=use_shell,
+                    env=env,
                 )
-                output = result.stdout
+                output = None
 
             self.logger.info(" %s successful.", description)
-            self.logger.debug("Command output: %s", output)
+            if output:
+                self.logger.debug("Command output: %s", output)
             if not self.verbose:
-                print(f" {description} successful.")
+                self._print(f" {description} successful.")
             return True
 
         except subprocess.CalledProcessError as e:
@@ -190,13 +349,13 @@ class LocalWindowsInstaller:
                 self.logger.error("Stdout: %s", e.stdout)
             if e.stderr:
                 self.logger.error("Stderr: %s", e.stderr)
-            print(error_msg)
+            self._print(error_msg)
             if self.verbose:
-                print(f"   Exit code: {e.returncode}")
+                self._print(f"   Exit code: {e.returncode}")
                 if e.stderr:
-                    print(f"   Error output: {e.stderr}")
+                    self._print(f"   Error output: {e.stderr}")
             else:
-                print(f"   Check log file for details: {self.log_file}")
+                self._print(f"   Check log file for details: {self.log_file}")
             if not allow_failure:
                 return False
             self.logger.warning("Command failed but continuing due to allow_failure=True")
@@ -205,74 +364,262 @@ class LocalWindowsInstaller:
         except Exception as e:
             error_msg = f" Unexpected error during {description}: {e}"
             self.logger.error(error_msg)
-            print(error_msg)
+            self._print(error_msg)
+            return False
+
+    @staticmethod
+    def _needs_shell(command):
+        """True on Windows when command[0] is a .cmd/.bat script or can't be resolved."""
+        if platform.system() != "Windows":
             return False
+        exe = str(command[0])
+        resolved = exe if os.path.isabs(exe) else (_which(exe) or exe)
+        return resolved.lower().endswith((".cmd", ".bat")) or not os.path.isfile(resolved)
+
+    async def _stream_command_async(self, command, use_shell, cwd, env=None):
+        """Run command, echoing and logging its merged output as it arrives.
+
+        Returns (return_code, output). Output is read in 64 KiB blocks and stays
+        as bytes on the way to the console; it is decoded only per DEBUG batch
+        and once for the return value. Each call drives its own event loop via
+        asyncio.run, so run_command stays safe to call from worker threads.
+        """
+        kwargs = {"stdout": asyncio.subprocess.PIPE, "stderr": asyncio.subprocess.STDOUT, "cwd": cwd, "env": env}
+        if use_shell:
+            process = await asyncio.create_subprocess_shell(command, **kwargs)
+        else:
+            process = await asyncio.create_subprocess_exec(*command, **kwargs)
+        output_lines = []
+        log_output = self.logger.isEnabledFor(logging.DEBUG)
+        logged = 0  # output_lines[:logged] already went to the DEBUG log
+        console = getattr(sys.stdout, "buffer", None)
+
+        def echo(lines):
+            # One console write per block read, however many lines it holds.
+            data = b"".join(b"   " + line + b"\n" for line in lines)
+            with self._console_lock:
+                if console is not None:
+                    sys.stdout.flush()  # keep ordering with earlier print() output
+                    console.write(data)
+                    console.flush()
+                else:
+                    sys.stdout.write(data.decode("utf-8", errors="replace"))
+                    sys.stdout.flush()
+
+        def log_batch():
+            text = b"\n".join(output_lines[logged:]).decode("utf-8", errors="replace")
+            self.logger.debug("OUTPUT:\n%s", text)
+
+        tail = b""
+        while True:
+            chunk = await process.stdout.read(1 << 16)
+            if chunk:
+                *complete, tail = (tail + chunk).split(b"\n")
+            else:
+                complete, tail = [tail], b""
+            lines = [line.rstrip() for line in complete]
+            lines = [line for line in lines if line]
+            if lines:
+                echo(lines)
+                output_lines.extend(lines)
+                # One DEBUG record per 64+ lines instead of one per line.
+                if log_output and len(output_lines) - logged >= 64:
+                    log_batch()
+                    logged = len(output_lines)
+            if not chunk:
+                break
+        if log_output and logged < len(output_lines):
+            log_batch()
+        output = b"\n".join(output_lines).decode("utf-8", errors="replace")
+        return await process.wait(), output
 
     def verify_vendored_backend(self):
-        print(" Verifying vendored backend...")
+        self._print(" Verifying vendored backend...")
         self.logger.info("Checking vendored derrian_backend directory")
-        if not os.path.exists(self.derrian_dir):
+        # One directory listing instead of a stat per required entry.
+        try:
+            with os.scandir(self.derrian_dir) as it:
+                present = {entry.name for entry in it if entry.is_dir()}
+        except OSError:
             error_msg = (
                 f" CRITICAL: Vendored backend not found at {self.derrian_dir}\n"
                 "   This repository should include trainer/derrian_backend in the clone."
             )
             self.logger.error(error_msg)
-            print(error_msg)
+            self._print(error_msg)
             return False
         required_dirs = {
             "sd_scripts": self.sd_scripts_dir,
             "lycoris": self.lycoris_dir,
         }
         for name, path in required_dirs.items():
-            if not os.path.exists(path):
+            if name not in present:
                 error_msg = f" Required directory '{name}' not found at {path}"
                 self.logger.error(error_msg)
-                print(error_msg)
+                self._print(error_msg)
                 return False
             self.logger.info("   Found %s at %s", name, path)
-            print(f"   {name} directory verified")
-        print(" Vendored backend verified successfully")
+            self._print(f"   {name} directory verified")
+        self._print(" Vendored backend verified successfully")
         self.logger.info("Vendored backend verification complete")
         return True
 
     def install_dependencies(self):
         if self.skip_install:
-            print(" Skipping dependency installation (--skip-install flag)")
+            self._print(" Skipping dependency installation (--skip-install flag)")
             self.logger.info("Skipping dependency installation due to --skip-install flag")
             return True
 
         # Use Windows-specific requirements file
         requirements_file = os.path.join(self.project_root, "requirements_windows.txt")
-        if not os.path.exists(requirements_file):
+        if not _exists(requirements_file):
             error_msg = f" CRITICAL: {requirements_file} not found!"
             self.logger.error(error_msg)
-            print(error_msg)
+            self._print(error_msg)
             return False
 
-        self.logger.info("Installing Windows dependencies from: %s", requirements_file)
+        # Skip the pip resolver walk entirely when the requirements (and the
+        # interpreter they were installed into) haven't changed since last success.
+        stamp_file = os.path.join(self.project_root, "logs", ".req_installed_hash")
+        req_hash = self._requirements_hash(requirements_file)
+        if not self.force and _read_stamp(stamp_file) == req_hash:
+            self.logger.info("Requirements unchanged since last install, skipping pip")
+            self._print(" ✅ Python requirements unchanged, skipping pip.")
+            return True
+
         # Add CUDA 12.1 index for PyTorch installation
-        install_cmd = self.package_manager["install_cmd"] + [
+        requirement_args = [
             "-r",
             requirements_file,
             "--extra-index-url",
             "https://download.pytorch.org/whl/cu121",
         ]
+        if not self.force and not self._dry_run_needs_install(requirement_args):
+            self.logger.info("pip dry run reports all requirements satisfied, skipping install")
+            self._print(" ✅ Python requirements already satisfied.")
+            _write_stamp(stamp_file, req_hash)
+            return True
+
+        self.logger.info("Installing Windows dependencies from: %s", requirements_file)
+        wheels_key = self._requirements_hash(requirements_file, per_environment=False) if WHEELHOUSE_ENABLED else None
+        wheels_dir = os.path.join(self.project_root, "wheels")
+        wheels_lock = os.path.join(wheels_dir, "requirements.lock")
+        if wheels_key and _read_stamp(os.path.join(wheels_dir, ".manifest")) == wheels_key:
+            install_cmd = self.package_manager["install_cmd"] + [
+                "--no-index",
+                "--find-links",
+                wheels_dir,
+                "-r",
+                wheels_lock,
+            ]
+            if self.run_command(install_cmd, "Installing Python packages (local wheelhouse)"):
+                _write_stamp(stamp_file, req_hash)
+                return True
+            self.logger.warning("Install from local wheelhouse failed, falling back to package indexes")
+
+        install_cmd = self.package_manager["install_cmd"] + requirement_args
         success = self.run_command(install_cmd, f"Installing Python packages with {self.package_manager['name']}")
+        if success:
+            _write_stamp(stamp_file, req_hash)
+            if wheels_key:
+                self._save_wheelhouse(wheels_dir, wheels_lock, wheels_key)
         return success
 
+    def _save_wheelhouse(self, wheels_dir, wheels_lock, wheels_key):
+        """Fill wheels/ with wheels of exactly what the index install just put in place.
+
+        Pins come from pip freeze, so nothing is re-resolved; the PyTorch stack,
+        editables and direct URL installs are left out. Non-fatal: on failure the
+        next install simply uses the package indexes again.
+        """
+        try:
+            result = subprocess.run(
+                [self.python_cmd, "-m", "pip", "freeze", "--exclude-editable"],
+                capture_output=True, text=True, encoding="utf-8", errors="replace", check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.logger.warning("Skipping wheelhouse, pip freeze failed: %s", e)
+            return
+        pins = []
+        for line in result.stdout.splitlines():
+            name, sep, _ = line.partition("==")
+            if sep and " @ " not in line and name.strip().lower() not in WHEELHOUSE_EXCLUDE:
+                pins.append(line.strip())
+
+        os.makedirs(wheels_dir, exist_ok=True)
+        with open(wheels_lock, "w", encoding="utf-8") as f:
+            f.write("\n".join(pins) + "\n")
+        wheel_cmd = [
+            self.python_cmd, "-m", "pip", "wheel", "--no-deps", "--prefer-binary", "-w", wheels_dir, "-r", wheels_lock,
+        ]
+        if self.run_command(wheel_cmd, "Saving local wheelhouse"):
+            _write_stamp(os.path.join(wheels_dir, ".manifest"), wheels_key)
+
+    def _dry_run_needs_install(self, requirement_args):
+        """Ask pip what an install would change; False only if it reports nothing.
+
+        Needs pip 23+ for a stable ``--dry-run --report`` JSON. Any failure (old pip,
+        no network, unparseable report) answers True so the real install still runs.
+        """
+        if self.package_manager.get("version", (0, 0)) < (23, 0):
+            return True
+        cmd = self.package_manager["install_cmd"] + [
+            "--dry-run",
+            "--quiet",
+            "--report",
+            "-",
+            *requirement_args,
+        ]
+        self.logger.info("Checking requirements with pip --dry-run")
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+            if result.returncode != 0:
+                self.logger.debug("pip dry run failed (%s): %s", result.returncode, result.stderr.strip())
+                return True
+            report = json.loads(result.stdout)
+        except (OSError, ValueError) as e:
+            self.logger.debug("pip dry run unavailable: %s", e)
+            return True
+        pending = [item.get("metadata", {}).get("name", "?") for item in report.get("install", [])]
+        if pending:
+            self.logger.info("pip dry run: %d package(s) to install: %s", len(pending), ", ".join(pending))
+        return bool(pending)
+
+    def _requirements_hash(self, requirements_file, per_environment=True):
+        """Hash of the requirements file and its -r includes, the interpreter and the platform.
+
+        The interpreter is identified by its executable and prefix, not just its
+        version, so a fresh venv (or --venv vs --no-venv) doesn't reuse the stamp.
+        per_environment=False drops those two, for state shared across venvs.
+        """
+        paths = []
+        pending = [requirements_file]
+        while pending:
+            path = pending.pop()
+            paths.append(path)
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2 and parts[0] in ("-r", "--requirement"):
+                        pending.append(os.path.join(os.path.dirname(path), parts[1]))
+        extra = [sys.version, platform.platform()]
+        if per_environment:
+            extra += [os.path.abspath(self.python_cmd), sys.prefix]
+        return _files_sha256(paths, *extra)
+
     def check_system_dependencies(self):
         self.logger.info(" Checking system dependencies for Windows...")
-        print(" Checking system dependencies for Windows...")
-        if not shutil.which("aria2c"):
+        self._print(" Checking system dependencies for Windows...")
+        if not _which("aria2c"):
             warning_msg = (
                 "Windows: aria2c not found. Please install manually:\n"
                 "   https://aria2.github.io/   or use 'choco install aria2' / 'scoop install aria2'"
             )
             self.logger.warning(warning_msg)
-            print(f"   {warning_msg}")
+            self._print(f"   {warning_msg}")
         else:
             self.logger.info("aria2c: Found")
-            print("   - aria2c: Found")
+            self._print("   - aria2c: Found")
         return True
 
     def check_microsoft_store_python(self):
@@ -296,54 +643,86 @@ class LocalWindowsInstaller:
                 "Current installation MAY work, but you might encounter issues.",
                 "!" * 70 + "\n",
             ]
-            for line in warning_lines:
-                print(line)
-                self.logger.warning(line)
-
-            # Give user a chance to cancel
-            print("Press Ctrl+C within 10 seconds to cancel, or wait to continue...")
-            import time
+            warning = "\n".join(warning_lines)
+            self._print(warning)
+            self.logger.warning(warning)
 
+            # Give user a chance to cancel without stalling unattended runs
+            self._print("Press N (or Ctrl+C) to cancel, any other key to continue. Continuing in 2 seconds...")
             try:
-                time.sleep(10)
+                key = _wait_for_key(2.0)
             except KeyboardInterrupt:
-                print("\nInstallation cancelled by user.")
+                key = "n"
+            if key and key.lower() == "n":
+                self._print("\nInstallation cancelled by user.")
                 sys.exit(0)
 
+    def _get_torch_info(self):
+        """Import torch once and cache what the installer needs from it.
+
+        Importing torch on Windows loads the CUDA DLLs and takes several seconds,
+        so the result (including a failed import) is kept until invalidated.
+        """
+        if self._torch_info is None:
+            try:
+                import torch  # pyright: ignore
+            except ImportError:
+                self._torch_info = {"installed": False}
+            else:
+                self._torch_info = {
+                    "installed": True,
+                    "version": torch.__version__,
+                    "cuda_available": torch.cuda.is_available(),
+                    "cuda_version": torch.version.cuda,
+                }
+        return self._torch_info
+
+    def _probe_torch_subprocess(self):
+        """Same shape as _get_torch_info, but from a fresh interpreter."""
+        probe = (
+            "import json, torch; print(json.dumps({'installed': True, 'version': torch.__version__, "
+            "'cuda_available': torch.cuda.is_available(), 'cuda_version': torch.version.cuda}))"
+        )
+        try:
+            result = subprocess.run([self.python_cmd, "-c", probe], capture_output=True, text=True)
+            if result.returncode == 0:
+                return json.loads(result.stdout.strip().splitlines()[-1])
+            self.logger.debug("torch probe failed: %s", result.stderr.strip())
+        except (OSError, ValueError, IndexError) as e:
+            self.logger.debug("torch probe failed: %s", e)
+        return {"installed": False}
+
     def install_pytorch(self):
         """
         Install PyTorch with CUDA 12.1 support for Windows.
         This is LOCAL INSTALLER ONLY - VastAI has PyTorch pre-installed.
         """
-        try:
-            import torch  # pyright: ignore
-
+        info = self._get_torch_info()
+        if info["installed"]:
             # PyTorch is already installed - check if it has CUDA
-            self.logger.info("PyTorch already installed: %s", torch.__version__)
-            if torch.cuda.is_available():
-                cuda_version = torch.version.cuda
-                self.logger.info("CUDA available: %s", cuda_version)
-                print(f"\n✅ PyTorch {torch.__version__} + CUDA {cuda_version} detected")
-                print("   GPU training is ready.\n")
+            self.logger.info("PyTorch already installed: %s", info["version"])
+            if info["cuda_available"]:
+                self.logger.info("CUDA available: %s", info["cuda_version"])
+                self._print(f"\n✅ PyTorch {info['version']} + CUDA {info['cuda_version']} detected")
+                self._print("   GPU training is ready.\n")
                 return True
             else:
                 # CPU-only PyTorch detected - need to reinstall with CUDA
-                print("\n" + "!" * 70)
-                print("🚨 CPU-only PyTorch detected!")
-                print("!" * 70)
-                print(f"Current: PyTorch {torch.__version__} (CPU-only)")
-                print("\nReinstalling PyTorch with CUDA 12.1 support...")
-                print("!" * 70 + "\n")
+                self._print("\n" + "!" * 70)
+                self._print("🚨 CPU-only PyTorch detected!")
+                self._print("!" * 70)
+                self._print(f"Current: PyTorch {info['version']} (CPU-only)")
+                self._print("\nReinstalling PyTorch with CUDA 12.1 support...")
+                self._print("!" * 70 + "\n")
 
                 # Uninstall CPU version
                 uninstall_cmd = [self.python_cmd, "-m", "pip", "uninstall", "-y", "torch", "torchvision", "torchaudio"]
                 self.run_command(uninstall_cmd, "Uninstalling CPU-only PyTorch")
-
-        except ImportError:
+        else:
             # PyTorch not installed - install with CUDA
-            print("\n" + "!" * 70)
-            print("⚠️  PyTorch not found - installing with CUDA 12.1 support")
-            print("!" * 70 + "\n")
+            self._print("\n" + "!" * 70)
+            self._print("⚠️  PyTorch not found - installing with CUDA 12.1 support")
+            self._print("!" * 70 + "\n")
 
         # Install PyTorch with CUDA 12.1
         pytorch_cmd = [
@@ -361,41 +740,49 @@ class LocalWindowsInstaller:
         success = self.run_command(pytorch_cmd, "Installing PyTorch with CUDA 12.1")
 
         if success:
-            # Verify installation
-            try:
-                import torch  # pyright: ignore
-
-                if torch.cuda.is_available():
-                    print(f"\n✅ PyTorch {torch.__version__} + CUDA {torch.version.cuda} installed successfully!")
-                    print("   GPU training is ready.\n")
-                    self.logger.info("PyTorch with CUDA installed successfully")
-                else:
-                    print("\n⚠️  PyTorch installed but CUDA not available. Check your NVIDIA drivers.")
-                    self.logger.warning("PyTorch installed but CUDA not available")
-            except ImportError:
-                print("\n❌ PyTorch installation failed.")
+            # Verify installation; the cached probe predates the install, and an
+            # already-imported torch can't be reloaded reliably, so ask a fresh
+            # interpreter instead.
+            info = self._torch_info = self._probe_torch_subprocess()
+            if not info["installed"]:
+                self._print("\n❌ PyTorch installation failed.")
                 self.logger.error("PyTorch installation failed")
                 return False
+            if info["cuda_available"]:
+                self._print(f"\n✅ PyTorch {info['version']} + CUDA {info['cuda_version']} installed successfully!")
+                self._print("   GPU training is ready.\n")
+                self.logger.info("PyTorch with CUDA installed successfully")
+            else:
+                self._print("\n⚠️  PyTorch installed but CUDA not available. Check your NVIDIA drivers.")
+                self.logger.warning("PyTorch installed but CUDA not available")
 
         return success
 
     # =============== NEW FRONTEND METHODS ===============
     def get_npm_executable(self):
-        """Find npm executable, handling Windows .cmd files and custom install locations."""
+        """Find npm executable, handling Windows .cmd files and custom install locations.
+
+        Resolved once per run; the frontend install and build both ask for it.
+        """
+        if self._npm_exe is None:
+            self._npm_exe = self._find_npm_executable()
+        return self._npm_exe
+
+    def _find_npm_executable(self):
         is_win = platform.system() == "Windows"
 
         # 1. Try the easy way
-        npm_path = shutil.which("npm")
+        npm_path = _which("npm")
         if npm_path:
             return npm_path
 
         # 2. If on Windows, check the Node neighbor (Fixes the C: vs I: jump)
         if is_win:
-            node_path = shutil.which("node")
+            node_path = _which("node")
             if node_path:
                 node_dir = os.path.dirname(node_path)
                 npm_cmd = os.path.join(node_dir, "npm.cmd")
-                if os.path.exists(npm_cmd):
+                if _exists(npm_cmd):
                     return npm_cmd
 
             # 3. Check the "Gamer" custom install spots
@@ -404,12 +791,12 @@ class LocalWindowsInstaller:
                 os.path.expandvars("%APPDATA%\\npm\\npm.cmd"),
             ]
             for spot in common_spots:
-                if os.path.exists(spot):
+                if _exists(spot):
                     return spot
 
         return "npm"  # Fallback to string and pray
 
-    def _npm_run(self, npm_exe, frontend_dir, args, description):
+    def _npm_run(self, npm_exe, frontend_dir, args, description, env=None):
         """Run an npm command scoped to frontend_dir without relying on subprocess cwd=.
 
         On Windows, passing cwd= to subprocess.run can raise "Invalid cwd parameter"
@@ -418,21 +805,39 @@ class LocalWindowsInstaller:
         cwd issue entirely because npm handles the chdir internally.
         """
         cmd = [npm_exe, "--prefix", frontend_dir, *args]
-        return self.run_command(cmd, description)
+        return self.run_command(cmd, description, env=env)
 
     def install_frontend_deps(self):
         """Install frontend dependencies if node_modules is missing (or --force)."""
         frontend_dir = os.path.join(self.project_root, "frontend")
-        if not os.path.exists(frontend_dir):
+        if not _exists(frontend_dir):
             self.logger.info("Frontend directory not found. Skipping.")
             return True
 
+        node_modules = os.path.join(frontend_dir, "node_modules")
+
+        # package.json/package-lock.json hash from the last successful install;
+        # a mismatch means node_modules is stale even though it exists.
+        stamp_file = os.path.join(frontend_dir, ".ktn_lock_hash")
+        lock_hash = self._frontend_lock_hash(frontend_dir)
+        stored_hash = _read_stamp(stamp_file)
+        stale = stored_hash is not None and stored_hash != lock_hash
+
+        # Decide before touching npm at all, so a re-run with everything in place
+        # never resolves (or launches) npm.
+        if not self.force and not stale and _dir_has_entries(node_modules):
+            if stored_hash is None:
+                _write_stamp(stamp_file, lock_hash)
+            self.logger.info("Frontend dependencies already installed.")
+            self._print(" ✅ Frontend dependencies already installed.")
+            return True
+
         # Find npm executable (handles Windows .cmd and custom install locations)
         npm_exe = self.get_npm_executable()
-        if npm_exe == "npm" and not shutil.which("npm"):
+        if npm_exe == "npm" and not _which("npm"):
             # Fallback failed - npm truly not found
             self.logger.warning("npm not found. Is Node.js installed?")
-            print(" ⚠️  npm not found! Please install Node.js 18+ from https://nodejs.org/")
+            self._print(" ⚠️  npm not found! Please install Node.js 18+ from https://nodejs.org/")
             return False
 
         # Verify npm is actually executable before doing anything destructive.
@@ -441,61 +846,83 @@ class LocalWindowsInstaller:
         npm_ok = self.run_command([npm_exe, "--version"], "Checking npm version")
         if not npm_ok:
             self.logger.warning("npm --version failed. Skipping frontend dependency install.")
-            print(" ⚠️  npm does not appear to be working. Skipping frontend install.")
+            self._print(" ⚠️  npm does not appear to be working. Skipping frontend install.")
             return False
 
-        node_modules = os.path.join(frontend_dir, "node_modules")
-
         # Only wipe node_modules AFTER we know npm can run.
         # Previously this happened before the npm call, which could leave the user
         # with no node_modules and no way to reinstall if npm then failed.
         if self.force and os.path.exists(node_modules):
             self.logger.info("--force: removing existing node_modules for clean reinstall...")
-            print(" 🔄 --force: removing node_modules for clean reinstall...")
+            self._print(" 🔄 --force: removing node_modules for clean reinstall...")
             try:
                 shutil.rmtree(node_modules)
             except Exception as e:
                 self.logger.warning("Could not remove node_modules: %s", e)
 
-        if self.force or not os.path.exists(node_modules):
-            self.logger.info("Installing frontend dependencies...")
-            print(" 📦 Installing frontend (Next.js) dependencies...")
+        self.logger.info("Installing frontend dependencies...")
+        self._print(" 📦 Installing frontend (Next.js) dependencies...")
+        install_args = self._pick_node_installer(frontend_dir)
+        success = self._npm_run(
+            npm_exe, frontend_dir,
+            install_args,
+            "Installing npm packages",
+        )
+        if not success and install_args[0] == "ci":
+            # npm ci refuses a lockfile that's out of sync with package.json
+            # (e.g. after a git pull); let npm install re-resolve it.
+            self.logger.warning("npm ci failed, falling back to npm install...")
             success = self._npm_run(
                 npm_exe, frontend_dir,
-                ["install"],
+                ["install", "--prefer-offline"],
                 "Installing npm packages",
             )
-            if not success:
-                # Retry with --force for stubborn platform-specific dep issues
-                self.logger.warning("npm install failed, retrying with --force...")
-                print(" ⚠️  Retrying npm install with --force...")
-                success = self._npm_run(
-                    npm_exe, frontend_dir,
-                    ["install", "--force"],
-                    "Installing npm packages (force)",
-                )
-            return success
-        else:
-            self.logger.info("Frontend dependencies already installed.")
-            print(" ✅ Frontend dependencies already installed.")
-            return True
+        if not success:
+            # Retry with --force for stubborn platform-specific dep issues
+            self.logger.warning("npm install failed, retrying with --force...")
+            self._print(" ⚠️  Retrying npm install with --force...")
+            success = self._npm_run(
+                npm_exe, frontend_dir,
+                ["install", "--force"],
+                "Installing npm packages (force)",
+            )
+        if success:
+            # npm install may have just written package-lock.json; hash the result.
+            _write_stamp(stamp_file, self._frontend_lock_hash(frontend_dir))
+        return success
+
+    @staticmethod
+    def _pick_node_installer(frontend_dir):
+        """npm arguments for the frontend install.
+
+        With a package-lock.json, ``npm ci`` installs straight from the lockfile
+        without re-resolving. The frontend ships no pnpm/bun lockfile, so switching
+        to those would mean a fresh resolve; stick with npm. ``--prefer-offline``
+        serves anything already in the npm cache without a registry round-trip.
+        """
+        if os.path.exists(os.path.join(frontend_dir, "package-lock.json")):
+            return ["ci", "--prefer-offline"]
+        return ["install", "--prefer-offline"]
+
+    @staticmethod
+    def _frontend_lock_hash(frontend_dir):
+        return _files_sha256(
+            [os.path.join(frontend_dir, "package.json"), os.path.join(frontend_dir, "package-lock.json")]
+        )
 
     def build_frontend(self):
         """Build Next.js app if .next/ is missing (or --force)."""
         frontend_dir = os.path.join(self.project_root, "frontend")
-        if not os.path.exists(frontend_dir):
+        if not _exists(frontend_dir):
             self.logger.info("Frontend directory not found. Skipping build.")
             return True
 
-        # Find npm executable
-        npm_exe = self.get_npm_executable()
-
         build_dir = os.path.join(frontend_dir, ".next")
         if self.force and os.path.exists(build_dir):
             # --force: wipe stale build so updated source is compiled fresh
             # (git pull changes source but leaves old .next in place)
             self.logger.info("--force: removing stale .next build for clean rebuild...")
-            print(" 🔄 --force: removing stale .next build...")
+            self._print(" 🔄 --force: removing stale .next build...")
             try:
                 shutil.rmtree(build_dir)
             except Exception as e:
@@ -503,11 +930,18 @@ class LocalWindowsInstaller:
 
         if self.force or not os.path.exists(build_dir):
             self.logger.info("Building Next.js production frontend...")
-            print(" 🏗️  Building Next.js production frontend...")
-            success = self._npm_run(npm_exe, frontend_dir, ["run", "build"], "Building Next.js app")
+            self._print(" 🏗️  Building Next.js production frontend...")
+            # npm is only resolved on the paths that actually run a build.
+            success = self._npm_run(
+                self.get_npm_executable(),
+                frontend_dir,
+                ["run", "build"],
+                "Building Next.js app",
+                env={**os.environ, **NEXT_BUILD_ENV},
+            )
             if not success:
                 self.logger.warning("Frontend build failed.")
-                print(" ⚠️  Frontend build failed. Backend will still work.")
+                self._print(" ⚠️  Frontend build failed. Backend will still work.")
             return success
         else:
             # Check if build is stale (source newer than build)
@@ -515,31 +949,33 @@ class LocalWindowsInstaller:
             if os.path.exists(build_id):
                 build_mtime = os.path.getmtime(build_id)
                 # Check git for latest commit time touching frontend/ or api/.
-                # Use shell=True + cd /d to avoid subprocess cwd= issues on Windows.
+                # git -C scopes to the repo without subprocess cwd= (which trips
+                # on non-C: drives on Windows) or a cmd.exe "cd /d" wrapper.
                 try:
-                    git_cmd = (
-                        f'cd /d "{self.project_root}" && '
-                        'git log -1 --format=%ct -- frontend/ api/'
-                    )
                     result = subprocess.run(
-                        git_cmd,
+                        ["git", "-C", self.project_root, "log", "-1", "--format=%ct", "--", "frontend/", "api/"],
                         capture_output=True,
                         text=True,
-                        shell=True,
                     )
                     latest_commit = int(result.stdout.strip()) if result.stdout.strip() else 0
                     if latest_commit > build_mtime:
                         self.logger.info("Build is stale — source updated since last build.")
-                        print(" 🔄 Build is stale (source files updated since last build). Rebuilding...")
-                        success = self._npm_run(npm_exe, frontend_dir, ["run", "build"], "Building Next.js app")
+                        self._print(" 🔄 Build is stale (source files updated since last build). Rebuilding...")
+                        success = self._npm_run(
+                            self.get_npm_executable(),
+                            frontend_dir,
+                            ["run", "build"],
+                            "Building Next.js app",
+                            env={**os.environ, **NEXT_BUILD_ENV},
+                        )
                         if not success:
                             self.logger.warning("Frontend rebuild failed.")
-                            print(" ⚠️  Frontend rebuild failed. Backend will still work.")
+                            self._print(" ⚠️  Frontend rebuild failed. Backend will still work.")
                         return success
                 except Exception as e:
                     self.logger.warning("Could not check build freshness: %s", e)
             self.logger.info("Frontend already built and up to date.")
-            print(" ✅ Frontend already built and up to date.")
+            self._print(" ✅ Frontend already built and up to date.")
             return True
 
     def install_comfyui(self):
@@ -550,9 +986,9 @@ class LocalWindowsInstaller:
         Required custom nodes for the bundled workflow templates are installed too.
         All failures are non-fatal — the training tool works without ComfyUI.
         """
-        if not shutil.which("git"):
+        if not _which("git"):
             self.logger.warning("git not found — skipping ComfyUI installation.")
-            print("   ⚠️  git not found. Install Git for Windows to enable ComfyUI auto-install.")
+            self._print("   ⚠️  git not found. Install Git for Windows to enable ComfyUI auto-install.")
             return False
 
         comfyui_dir = os.path.join(self.project_root, "ComfyUI")
@@ -561,7 +997,7 @@ class LocalWindowsInstaller:
         # Clone or pull ComfyUI
         if os.path.isdir(os.path.join(comfyui_dir, ".git")):
             self.logger.info("ComfyUI already cloned, pulling updates...")
-            print("   ComfyUI already cloned — pulling updates...")
+            self._print("   ComfyUI already cloned — pulling updates...")
             self.run_command(
                 ["git", "pull", "--ff-only"],
                 "Updating ComfyUI",
@@ -676,14 +1112,14 @@ class LocalWindowsInstaller:
                     failed_nodes.append(f"{node_name} (requirements)")
 
         if failed_nodes:
-            print("   ⚠️  Custom nodes that did NOT fully install: " + ", ".join(failed_nodes))
-            print("       Re-run the installer, or install them in-app via ComfyUI-Manager.")
+            self._print("   ⚠️  Custom nodes that did NOT fully install: " + ", ".join(failed_nodes))
+            self._print("       Re-run the installer, or install them in-app via ComfyUI-Manager.")
             self.logger.warning("Custom nodes not fully installed: %s", ", ".join(failed_nodes))
         else:
             self.logger.info("All custom nodes installed successfully.")
 
         self.logger.info("ComfyUI installation complete.")
-        print("   ✅ ComfyUI installation complete.")
+        self._print("   ✅ ComfyUI installation complete.")
         return True
 
     def _download_comfyui_models(self, models_dir: str) -> None:
@@ -714,15 +1150,15 @@ class LocalWindowsInstaller:
         for rel_path, url, label in models_to_download:
             dest = os.path.join(models_dir, rel_path)
             if os.path.exists(dest):
-                print(f"   ✅ {label} already present, skipping")
+                self._print(f"   ✅ {label} already present, skipping")
                 continue
-            print(f"   ⬇️  Downloading {label}...")
+            self._print(f"   ⬇️  Downloading {label}...")
             try:
                 urllib.request.urlretrieve(url, dest)
-                print(f"   ✅ {label} downloaded")
+                self._print(f"   ✅ {label} downloaded")
                 self.logger.info("Downloaded %s to %s", label, dest)
             except Exception as exc:
-                print(f"   ⚠️  {label} download failed (non-fatal): {exc}")
+                self._print(f"   ⚠️  {label} download failed (non-fatal): {exc}")
                 self.logger.warning("Failed to download %s: %s", label, exc)
 
         self._sync_knx_trainer_models(models_dir)
@@ -740,11 +1176,11 @@ class LocalWindowsInstaller:
         try:
             from huggingface_hub import snapshot_download
         except ImportError as exc:
-            print(f"   ⚠️  huggingface_hub unavailable — skipping Ecosystem-Models sync: {exc}")
+            self._print(f"   ⚠️  huggingface_hub unavailable — skipping Ecosystem-Models sync: {exc}")
             self.logger.warning("huggingface_hub unavailable for Ecosystem-Models sync: %s", exc)
             return
 
-        print("   ⬇️  Syncing Ecosystem-Models (VAEs, upscalers, detailers)...")
+        self._print("   ⬇️  Syncing Ecosystem-Models (VAEs, upscalers, detailers)...")
         try:
             snapshot_download(
                 repo_id="KtiseosNyx/Ecosystem-Models",
@@ -755,10 +1191,10 @@ class LocalWindowsInstaller:
                 ],
                 ignore_patterns=["*.rar", "README.md", ".gitattributes"],
             )
-            print("   ✅ Ecosystem-Models synced into ComfyUI/models")
+            self._print("   ✅ Ecosystem-Models synced into ComfyUI/models")
             self.logger.info("Synced Ecosystem-Models into %s", models_dir)
         except Exception as exc:
-            print(f"   ⚠️  Ecosystem-Models sync failed (non-fatal): {exc}")
+            self._print(f"   ⚠️  Ecosystem-Models sync failed (non-fatal): {exc}")
             self.logger.warning("Failed to sync Ecosystem-Models: %s", exc)
 
     # ====================================================
@@ -770,29 +1206,111 @@ class LocalWindowsInstaller:
             "Custom Optimizers": os.path.join(self.derrian_dir, "custom_scheduler"),
             "Kohya's SD Scripts": self.sd_scripts_dir,
         }
+        tasks = []
         for name, path in editable_installs.items():
-            setup_py = os.path.join(path, "setup.py")
-            pyproject_toml = os.path.join(path, "pyproject.toml")
-
-            if os.path.exists(setup_py) or os.path.exists(pyproject_toml):
-                abs_path = os.path.normpath(os.path.abspath(path))
-                if not os.path.isdir(abs_path):
-                    self.logger.warning("Skipping editable install for %s: path not found: %s", name, abs_path)
-                    continue
-
-                self.logger.info("Installing %s in editable mode from %s", name, abs_path)
-                install_cmd = self.package_manager["install_cmd"] + ["-e", abs_path]
-                success = self.run_command(install_cmd, f"Editable install for {name}", allow_failure=True)
+            abs_path = os.path.normpath(os.path.abspath(path))
+            # One listing per package instead of a stat per candidate file.
+            try:
+                with os.scandir(abs_path) as it:
+                    names = {entry.name for entry in it}
+            except OSError:
+                self.logger.warning("Skipping editable install for %s: path not found: %s", name, abs_path)
+                continue
 
-                if not success:
-                    warning_msg = f"Could not install {name} in editable mode. Training might still work."
-                    self.logger.warning(warning_msg)
-                    print(f"   - {warning_msg}")
+            if "setup.py" in names or "pyproject.toml" in names:
+                tasks.append((name, abs_path))
             else:
                 self.logger.debug("No setup.py or pyproject.toml found for %s at %s, skipping", name, path)
 
+        # One pip call for all of them: one interpreter start and one resolver pass,
+        # and no concurrent writers racing on shared dependencies in site-packages.
+        if tasks:
+            install_cmd = self.package_manager["install_cmd"] + self._editable_install_flags()
+            for _, abs_path in tasks:
+                install_cmd += ["-e", abs_path]
+            names = ", ".join(name for name, _ in tasks)
+            self.logger.info("Installing in editable mode: %s", names)
+            if self.run_command(install_cmd, "Editable installs for vendored packages"):
+                self.logger.info("Editable installs finished: %s", names)
+            else:
+                # pip installs nothing if any target fails; retry one by one so a
+                # single broken package doesn't take the others down with it.
+                self.logger.warning("Batched editable install failed, retrying packages individually")
+                results = [self._editable_install(*task) for task in tasks]
+                self.logger.info(
+                    "Editable installs finished: %s",
+                    ", ".join(f"{name} {'ok' if ok else 'failed'}" for name, ok in results),
+                )
+
+        return True
+
+    def _editable_install_flags(self):
+        return EDITABLE_INSTALL_FLAGS + ["--cache-dir", self.pip_cache_dir]
+
+    def _editable_install(self, name, abs_path):
+        """Install one vendored package in editable mode. Returns (name, success)."""
+        self.logger.info("Installing %s in editable mode from %s", name, abs_path)
+        install_cmd = self.package_manager["install_cmd"] + self._editable_install_flags() + ["-e", abs_path]
+        success = self.run_command(install_cmd, f"Editable install for {name}", allow_failure=True)
+
+        if not success:
+            warning_msg = f"Could not install {name} in editable mode. Training might still work."
+            self.logger.warning(warning_msg)
+            self._print(f"   - {warning_msg}")
+        return name, success
+
+    async def _install_async(self):
+        """Run the backend and frontend install pipelines concurrently.
+
+        Both are blocking (run_command drives its own event loop), so each goes
+        to a worker thread. Returns the backend result; frontend failures are
+        non-fatal, as before.
+        """
+        backend_ok, _ = await asyncio.gather(
+            asyncio.to_thread(self._backend_pipeline),
+            asyncio.to_thread(self._frontend_pipeline),
+        )
+        return backend_ok
+
+    def _backend_pipeline(self):
+        # Install PyTorch with CUDA FIRST - this checks for CPU-only PyTorch
+        # and replaces it with CUDA version if needed
+        if not self.skip_install:
+            if not self.install_pytorch():
+                self.logger.warning("PyTorch installation had issues - continuing anyway")
+
+        # Install remaining dependencies
+        if not self.install_dependencies():
+            return False
+
+        # Editable installs resolve against the requirements installed above
+        if not self.apply_special_fixes_and_installs():
+            warning_msg = "Some special fixes or editable installs failed."
+            self.logger.warning(warning_msg)
+            self._print(f" {warning_msg}")
         return True
 
+    def _frontend_pipeline(self):
+        # Always ensure frontend is ready, even with --skip-install.
+        # Wrapped in try/except so any unexpected exception here does NOT
+        # kill the entire installation (Python backend is already installed).
+        try:
+            if not self.install_frontend_deps():
+                self.logger.warning("Frontend dependency installation failed.")
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as fe:
+            self.logger.warning("Unexpected error in frontend dep install: %s", fe)
+            self._print(f" ⚠️  Frontend dependency install skipped due to error: {fe}")
+        try:
+            if not self.build_frontend():
+                self.logger.warning("Frontend build failed.")
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as fe:
+            self.logger.warning("Unexpected error in frontend build: %s", fe)
+            self._print(f" ⚠️  Frontend build skipped due to error: {fe}")
+
     def check_already_installed(self):
         """Check if a previous installation exists. Returns True if we should proceed."""
         if not os.path.exists(self.install_marker):
@@ -807,19 +1325,19 @@ class LocalWindowsInstaller:
 
         if self.force:
             self.logger.info("Previous installation found (%s), but --force flag set. Reinstalling.", prev_info)
-            print(f"\n Previous installation detected ({prev_info})")
-            print(" --force flag set, proceeding with reinstall...\n")
+            self._print(f"\n Previous installation detected ({prev_info})")
+            self._print(" --force flag set, proceeding with reinstall...\n")
             return True
 
-        print("\n" + "=" * 70)
-        print(" Installation already completed!")
-        print("=" * 70)
-        print(f"\n Previous install: {prev_info}")
-        print("\n If you want to reinstall, use one of these options:")
-        print("   install.bat --force          Reinstall everything")
-        print("   install.bat --skip-install   Rebuild frontend only (fast)")
-        print("\n To start the app: start_services_local.bat")
-        print("=" * 70 + "\n")
+        self._print("\n" + "=" * 70)
+        self._print(" Installation already completed!")
+        self._print("=" * 70)
+        self._print(f"\n Previous install: {prev_info}")
+        self._print("\n If you want to reinstall, use one of these options:")
+        self._print("   install.bat --force          Reinstall everything")
+        self._print("   install.bat --skip-install   Rebuild frontend only (fast)")
+        self._print("\n To start the app: start_services_local.bat")
+        self._print("=" * 70 + "\n")
         return False
 
     def write_install_marker(self):
@@ -834,6 +1352,7 @@ class LocalWindowsInstaller:
             self.logger.warning("Could not write install marker: %s", e)
 
     def run_installation(self):
+        _ensure_colorama()
         self.print_banner()
 
         # Check if already installed (skip with --force)
@@ -849,68 +1368,38 @@ class LocalWindowsInstaller:
             if not self.verify_vendored_backend():
                 error_msg = "Halting installation due to vendored backend verification failure."
                 self.logger.error(error_msg)
-                print(f" {error_msg}")
+                self._print(f" {error_msg}")
                 return False
             if not self.check_system_dependencies():
                 error_msg = "System dependency check failed."
                 self.logger.error(error_msg)
-                print(f" {error_msg}")
+                self._print(f" {error_msg}")
                 return False
 
-            # Install PyTorch with CUDA FIRST - this checks for CPU-only PyTorch
-            # and replaces it with CUDA version if needed
-            if not self.skip_install:
-                if not self.install_pytorch():
-                    self.logger.warning("PyTorch installation had issues - continuing anyway")
-
-            # Install remaining dependencies
-            if not self.install_dependencies():
+            # The Python backend (PyPI/PyTorch index, site-packages) and the
+            # frontend (npm registry, frontend/) share nothing, so their downloads
+            # overlap instead of the npm install waiting on pip.
+            if not asyncio.run(self._install_async()):
                 error_msg = "Halting installation due to dependency installation failure."
                 self.logger.error(error_msg)
-                print(f" {error_msg}")
+                self._print(f" {error_msg}")
                 return False
-            if not self.apply_special_fixes_and_installs():
-                warning_msg = "Some special fixes or editable installs failed."
-                self.logger.warning(warning_msg)
-                print(f" {warning_msg}")
-
-            # =============== NEW: FRONTEND SETUP ===============
-            # Always ensure frontend is ready, even with --skip-install.
-            # Wrapped in try/except so any unexpected exception here does NOT
-            # kill the entire installation (Python backend is already installed).
-            try:
-                if not self.install_frontend_deps():
-                    self.logger.warning("Frontend dependency installation failed.")
-            except (KeyboardInterrupt, SystemExit):
-                raise
-            except Exception as fe:
-                self.logger.warning("Unexpected error in frontend dep install: %s", fe)
-                print(f" ⚠️  Frontend dependency install skipped due to error: {fe}")
-            try:
-                if not self.build_frontend():
-                    self.logger.warning("Frontend build failed.")
-            except (KeyboardInterrupt, SystemExit):
-                raise
-            except Exception as fe:
-                self.logger.warning("Unexpected error in frontend build: %s", fe)
-                print(f" ⚠️  Frontend build skipped due to error: {fe}")
-            # ===================================================
 
             # =============== COMFYUI SETUP ==================
             # Optional — failures here do NOT abort the installation.
             if self.skip_comfyui:
                 self.logger.info("Skipping ComfyUI installation (--no-comfyui).")
-                print("\n 🎨 [ComfyUI] Skipped (--no-comfyui).")
+                self._print("\n 🎨 [ComfyUI] Skipped (--no-comfyui).")
             else:
                 try:
                     self.logger.info("Installing ComfyUI (optional — failures are non-fatal)...")
-                    print("\n 🎨 [ComfyUI] Installing ComfyUI and required custom nodes...")
+                    self._print("\n 🎨 [ComfyUI] Installing ComfyUI and required custom nodes...")
                     self.install_comfyui()
                 except (KeyboardInterrupt, SystemExit):
                     raise
                 except Exception as ce:
                     self.logger.warning("Unexpected error in ComfyUI install: %s", ce)
-                    print(f" ⚠️  ComfyUI install skipped due to error: {ce}")
+                    self._print(f" ⚠️  ComfyUI install skipped due to error: {ce}")
             # ===================================================
 
             end_time = datetime.datetime.now()
@@ -954,18 +1443,17 @@ class LocalWindowsInstaller:
                 "   - 8-bit optimizers (AdamW8bit)? bitsandbytes works out of the box!",
                 "=" * 70,
             ]
-            for line in completion_lines:
-                print(line)
-                if line.strip():
-                    self.logger.info(line)
+            completion = "\n".join(completion_lines)
+            self._print(completion)
+            self.logger.info(completion)
 
             self.write_install_marker()
             return True
         except Exception as e:
             error_msg = f"Unexpected error during installation: {e}"
             self.logger.error(error_msg)
-            print(f" {error_msg}")
-            print(f"Check log file for details: {self.log_file}")
+            self._print(f" {error_msg}")
+            self._print(f"Check log file for details: {self.log_file}")
             return False
 
 
@@ -23,29 +23,64 @@ Services:
     - job_manager: Job tracking (used internally by services)
 """
 
-# Service instances (singletons)
-from .training_service import training_service
-from .tagging_service import tagging_service
-from .dataset_service import dataset_service
-from .caption_service import caption_service
-from .captioning_service import captioning_service
-from .lora_service import lora_service
-from .model_service import model_service
-from .convert_service import convert_service
-from .crop_service import crop_service
-from .jobs import job_manager
-
-# Service classes (if you need to instantiate manually)
-from .training_service import TrainingService
-from .tagging_service import TaggingService
-from .dataset_service import DatasetService
-from .caption_service import CaptionService
-from .captioning_service import CaptioningService
-from .lora_service import LoRAService
-from .model_service import ModelService
-from .convert_service import ConvertService
-from .crop_service import CropService
-from .jobs import JobManager
+import importlib
+import sys
+import types
+
+# Public name -> submodule that defines it. Nothing is imported until first
+# access (PEP 562), so `from services import caption_service` doesn't pay
+# for the training, tagging or model stacks.
+_LAZY_ATTRS = {
+    # Service instances (singletons)
+    "training_service": ".training_service",
+    "tagging_service": ".tagging_service",
+    "dataset_service": ".dataset_service",
+    "caption_service": ".caption_service",
+    "captioning_service": ".captioning_service",
+    "lora_service": ".lora_service",
+    "model_service": ".model_service",
+    "convert_service": ".convert_service",
+    "crop_service": ".crop_service",
+    "job_manager": ".jobs",
+    # Service classes (if you need to instantiate manually)
+    "TrainingService": ".training_service",
+    "TaggingService": ".tagging_service",
+    "DatasetService": ".dataset_service",
+    "CaptionService": ".caption_service",
+    "CaptioningService": ".captioning_service",
+    "LoRAService": ".lora_service",
+    "ModelService": ".model_service",
+    "ConvertService": ".convert_service",
+    "CropService": ".crop_service",
+    "JobManager": ".jobs",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _ServicesModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing services.caption_service binds that submodule onto the
+        # package under the singleton's name; don't let it shadow the
+        # singleton (the old eager imports rebound it the same way).
+        if name in _LAZY_ATTRS and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ServicesModule
 
 __all__ = [
     # Singleton instances (use these in most cases)
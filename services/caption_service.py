@@ -9,10 +9,14 @@ Handles:
 - Bulk operations on entire datasets
 """
 
+import asyncio
+import os
 import re
 import logging
+import stat
+import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from services.models.caption import (
     AddTriggerWordRequest,
@@ -28,6 +32,68 @@ from services.core.validation import validate_dataset_path, ALLOWED_IMAGE_EXTENS
 
 logger = logging.getLogger(__name__)
 
+# Caption files read/written at once by bulk operations (bounds open file handles)
+_MAX_CONCURRENT_FILES = 32
+
+_T = TypeVar("_T")
+
+# Splits a stripped caption into tags, swallowing whitespace around commas
+_TAG_SPLIT_RE = re.compile(r'\s*,\s*')
+
+
+def _swap_suffix(path: str, new_ext: str) -> str:
+    """Path.with_suffix() on a plain string (no Path parsing per call)."""
+    dot = path.rfind('.')
+    # Only a dot inside the final name, and not a leading one, starts a suffix
+    if dot > max(path.rfind('/'), path.rfind(os.sep)) + 1:
+        path = path[:dot]
+    return path + new_ext
+
+
+def _decode_caption(raw: bytes) -> str:
+    """Decode caption bytes the way read_text does, including universal newlines."""
+    return raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+# Mode for newly created captions; mkstemp files start as 0600
+_NEW_FILE_MODE = 0o644
+
+
+def _atomic_write_bytes(path, data: bytes) -> None:
+    """
+    Replace a file's contents via a unique sibling temp file and os.replace.
+
+    Readers see either the old or the new caption, never a truncated one, and
+    concurrent writers to the same caption never share a temp file. The
+    existing file's permissions are kept.
+    No fsync: captions are cheap to regenerate, so bulk edits skip the flush.
+    """
+    path = os.fspath(path)
+    directory, name = os.path.split(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = _NEW_FILE_MODE
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix='.' + name, suffix='.tmp')
+    try:
+        with open(fd, 'wb', buffering=0) as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _atomic_write_text(path, text: str) -> None:
+    """UTF-8 text variant of _atomic_write_bytes, with write_text's newline translation."""
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    _atomic_write_bytes(path, text.encode('utf-8'))
+
 
 class CaptionService:
     """
@@ -40,6 +106,41 @@ class CaptionService:
     - Text replacement
     """
 
+    @staticmethod
+    def _list_caption_files(dataset_path: Path, caption_extension: str) -> List[Path]:
+        """
+        Caption files directly inside dataset_path, matched like
+        dataset_path.glob(f"*{caption_extension}"): case-insensitive on
+        Windows (normcase), and dotfiles such as .x.txt included.
+        """
+        suffix = os.path.normcase(caption_extension)
+        with os.scandir(dataset_path) as it:
+            return [
+                Path(entry.path) for entry in it
+                if os.path.normcase(entry.name).endswith(suffix) and entry.is_file()
+            ]
+
+    async def _process_files(
+        self, process: Callable[[_T], Tuple[int, Optional[str]]], items: Iterable[_T]
+    ) -> Tuple[int, List[str]]:
+        """
+        Run a blocking per-file step over items on worker threads.
+
+        process returns (modified, error), where modified is a bool or a count
+        of files. Returns (files_modified, errors), with errors in item order.
+        Items must not share a target file; callers group those first.
+        """
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FILES)
+
+        async def run(item: _T) -> Tuple[int, Optional[str]]:
+            async with semaphore:
+                return await asyncio.to_thread(process, item)
+
+        results = await asyncio.gather(*(run(item) for item in items))
+        files_modified = sum(modified for modified, _ in results)
+        errors = [error for _, error in results if error]
+        return files_modified, errors
+
     async def add_trigger_word(self, request: AddTriggerWordRequest) -> CaptionOperationResponse:
         """
         Add a trigger word to all captions in a dataset.
@@ -56,37 +157,45 @@ class CaptionService:
             if not dataset_path.exists():
                 raise NotFoundError(f"Dataset not found: {request.dataset_dir}")
 
-            files_modified = 0
-            errors = []
-
-            # Process all caption files
-            for image_file in dataset_path.iterdir():
-                if not image_file.is_file():
-                    continue
-                if image_file.suffix.lower() not in ALLOWED_IMAGE_EXTENSIONS:
-                    continue
-
-                caption_file = image_file.with_suffix(request.caption_extension)
+            # Group images by caption file: x.png and x.jpg share x.txt, and
+            # concurrent read-modify-writes of one caption would lose updates.
+            allowed = ALLOWED_IMAGE_EXTENSIONS
+            images_by_caption: Dict[str, List[str]] = {}
+            with os.scandir(dataset_path) as it:
+                for entry in sorted(it, key=lambda e: e.name):
+                    name = entry.name
+                    dot = name.rfind('.')
+                    # dot > 0: ".png" alone has no suffix
+                    if dot > 0 and name[dot:].lower() in allowed and entry.is_file():
+                        caption_path = _swap_suffix(entry.path, request.caption_extension)
+                        images_by_caption.setdefault(caption_path, []).append(name)
+
+            def process(group: Tuple[str, List[str]]) -> Tuple[int, Optional[str]]:
+                caption_path, image_names = group
+                caption_file = Path(caption_path)
 
                 try:
                     # Read existing caption or create empty
-                    if caption_file.exists():
+                    try:
                         caption_text = caption_file.read_text(encoding='utf-8').strip()
-                    else:
+                    except FileNotFoundError:
                         caption_text = ""
 
-                    # Add trigger word
-                    if request.position == "start":
-                        new_caption = f"{request.trigger_word}, {caption_text}" if caption_text else request.trigger_word
-                    else:  # end
-                        new_caption = f"{caption_text}, {request.trigger_word}" if caption_text else request.trigger_word
+                    # Add trigger word once per image, as if each were processed in turn
+                    for _ in image_names:
+                        if request.position == "start":
+                            caption_text = f"{request.trigger_word}, {caption_text}" if caption_text else request.trigger_word
+                        else:  # end
+                            caption_text = f"{caption_text}, {request.trigger_word}" if caption_text else request.trigger_word
 
                     # Write back
-                    caption_file.write_text(new_caption, encoding='utf-8')
-                    files_modified += 1
+                    _atomic_write_text(caption_file, caption_text)
+                    return len(image_names), None
 
                 except Exception as e:
-                    errors.append(f"{image_file.name}: {str(e)}")
+                    return 0, f"{', '.join(image_names)}: {str(e)}"
+
+            files_modified, errors = await self._process_files(process, images_by_caption.items())
 
             logger.info(f"Added trigger word '{request.trigger_word}' to {files_modified} captions")
 
@@ -121,29 +230,40 @@ class CaptionService:
             if not dataset_path.exists():
                 raise NotFoundError(f"Dataset not found: {request.dataset_dir}")
 
-            files_modified = 0
-            errors = []
+            # Remove unwanted tags (case-insensitive)
+            tags_lower = frozenset(tag.lower() for tag in request.tags_to_remove)
+            tags_bytes = [tag.encode('utf-8') for tag in tags_lower]
 
-            # Process all caption files
-            for caption_file in dataset_path.glob(f"*{request.caption_extension}"):
+            def process(caption_file: Path) -> Tuple[bool, Optional[str]]:
                 try:
-                    caption_text = caption_file.read_text(encoding='utf-8').strip()
+                    raw = caption_file.read_bytes()
 
-                    # Split into tags
-                    tags = [tag.strip() for tag in caption_text.split(',')]
+                    # Skip captions that can't contain any target tag. Only
+                    # trusted for ASCII, where bytes.lower() matches str.lower().
+                    if raw.isascii():
+                        raw_lower = raw.lower()
+                        if not any(tag in raw_lower for tag in tags_bytes):
+                            return False, None
+
+                    caption_text = _decode_caption(raw).strip()
 
-                    # Remove unwanted tags (case-insensitive)
-                    tags_lower = {tag.lower() for tag in request.tags_to_remove}
+                    # Split into tags
+                    tags = _TAG_SPLIT_RE.split(caption_text)
                     filtered_tags = [tag for tag in tags if tag.lower() not in tags_lower]
 
                     # Write back if changed
                     if len(filtered_tags) != len(tags):
                         new_caption = ', '.join(filtered_tags)
-                        caption_file.write_text(new_caption, encoding='utf-8')
-                        files_modified += 1
+                        _atomic_write_text(caption_file, new_caption)
+                        return True, None
+                    return False, None
 
                 except Exception as e:
-                    errors.append(f"{caption_file.name}: {str(e)}")
+                    return False, f"{caption_file.name}: {str(e)}"
+
+            files_modified, errors = await self._process_files(
+                process, self._list_caption_files(dataset_path, request.caption_extension)
+            )
 
             logger.info(f"Removed tags from {files_modified} captions")
 
@@ -178,38 +298,51 @@ class CaptionService:
             if not dataset_path.exists():
                 raise NotFoundError(f"Dataset not found: {request.dataset_dir}")
 
-            files_modified = 0
-            errors = []
-
-            # Process all caption files
-            for caption_file in dataset_path.glob(f"*{request.caption_extension}"):
+            # Compile once for the whole dataset; an invalid pattern fails the
+            # request up front instead of once per caption file.
+            if request.use_regex:
                 try:
-                    caption_text = caption_file.read_text(encoding='utf-8')
-
-                    # Replace text
-                    if request.use_regex:
-                        try:
-                            new_caption = re.sub(
-                                request.find_text,
-                                request.replace_text,
-                                caption_text
-                            )
-                        except re.error as e:
-                            errors.append(f"{caption_file.name}: invalid regex: {e}")
-                            continue
-                    else:
-                        new_caption = caption_text.replace(
-                            request.find_text,
-                            request.replace_text
-                        )
+                    pattern = re.compile(request.find_text)
+                except re.error as e:
+                    raise ValidationError(f"Invalid regex: {e}")
 
-                    # Write back if changed
-                    if new_caption != caption_text:
-                        caption_file.write_text(new_caption, encoding='utf-8')
-                        files_modified += 1
+                def process(caption_file: Path) -> Tuple[bool, Optional[str]]:
+                    try:
+                        caption_text = caption_file.read_text(encoding='utf-8')
 
-                except Exception as e:
-                    errors.append(f"{caption_file.name}: {str(e)}")
+                        # Replace text
+                        new_caption, matches = pattern.subn(request.replace_text, caption_text)
+
+                        # Write back if changed
+                        if matches and new_caption != caption_text:
+                            _atomic_write_text(caption_file, new_caption)
+                            return True, None
+                        return False, None
+
+                    except Exception as e:
+                        return False, f"{caption_file.name}: {str(e)}"
+            else:
+                # Compare decoded text, not raw bytes: read_text normalizes \r\n
+                # (so a find_text with \n matches CRLF captions) and reports
+                # invalid UTF-8 instead of rewriting the file.
+                def process(caption_file: Path) -> Tuple[bool, Optional[str]]:
+                    try:
+                        caption_text = caption_file.read_text(encoding='utf-8')
+                        if request.find_text not in caption_text:
+                            return False, None
+
+                        new_caption = caption_text.replace(request.find_text, request.replace_text)
+                        if new_caption != caption_text:
+                            _atomic_write_text(caption_file, new_caption)
+                            return True, None
+                        return False, None
+
+                    except Exception as e:
+                        return False, f"{caption_file.name}: {str(e)}"
+
+            files_modified, errors = await self._process_files(
+                process, self._list_caption_files(dataset_path, request.caption_extension)
+            )
 
             logger.info(f"Replaced text in {files_modified} captions")
 
@@ -240,33 +373,35 @@ class CaptionService:
         """
         try:
             from services.core.validation import validate_image_path
-            image_path = validate_image_path(request.image_path)
-            caption_path = image_path.with_suffix(request.caption_extension)
+            image_path = str(validate_image_path(request.image_path))
+            caption_path = _swap_suffix(image_path, request.caption_extension)
 
-            if caption_path.exists():
-                caption_text = caption_path.read_text(encoding='utf-8')
-                return CaptionReadResponse(
-                    success=True,
-                    image_path=str(image_path),
-                    caption_path=str(caption_path),
-                    caption_text=caption_text,
-                    exists=True
-                )
-            else:
+            try:
+                with open(caption_path, encoding='utf-8') as f:
+                    caption_text = f.read()
+            except FileNotFoundError:
                 return CaptionReadResponse(
                     success=True,
-                    image_path=str(image_path),
-                    caption_path=str(caption_path),
+                    image_path=image_path,
+                    caption_path=caption_path,
                     caption_text=None,
                     exists=False
                 )
 
+            return CaptionReadResponse(
+                success=True,
+                image_path=image_path,
+                caption_path=caption_path,
+                caption_text=caption_text,
+                exists=True
+            )
+
         except Exception as e:
             logger.error(f"Failed to read caption: {e}")
             return CaptionReadResponse(
                 success=False,
                 image_path=request.image_path,
-                caption_path=str(Path(request.image_path).with_suffix(request.caption_extension)),
+                caption_path=_swap_suffix(request.image_path, request.caption_extension),
                 caption_text=None,
                 exists=False
             )
@@ -283,20 +418,21 @@ class CaptionService:
         """
         try:
             from services.core.validation import validate_image_path
-            image_path = validate_image_path(request.image_path)
-            caption_path = image_path.with_suffix(request.caption_extension)
+            image_path = str(validate_image_path(request.image_path))
+            caption_path = _swap_suffix(image_path, request.caption_extension)
+            caption_dir, caption_name = os.path.split(caption_path)
 
             # Ensure parent directory exists
-            caption_path.parent.mkdir(parents=True, exist_ok=True)
+            os.makedirs(caption_dir, exist_ok=True)
 
             # Write caption
-            caption_path.write_text(request.caption_text, encoding='utf-8')
+            _atomic_write_text(caption_path, request.caption_text)
 
-            logger.info(f"Wrote caption: {caption_path.name}")
+            logger.info(f"Wrote caption: {caption_name}")
 
             return CaptionOperationResponse(
                 success=True,
-                message=f"Caption written to {caption_path.name}",
+                message=f"Caption written to {caption_name}",
                 files_modified=1,
                 errors=[]
             )
@@ -6,7 +6,7 @@ All paths are resolved and checked to ensure they're within allowed directories.
 """
 
 from pathlib import Path
-from typing import Set
+from typing import FrozenSet
 
 from .exceptions import ValidationError
 
@@ -18,7 +18,7 @@ OUTPUT_DIR = (PROJECT_ROOT / "output").resolve()
 VAE_DIR = (PROJECT_ROOT / "vae").resolve()
 
 # Allowed image extensions
-ALLOWED_IMAGE_EXTENSIONS: Set[str] = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".jfif"}
+ALLOWED_IMAGE_EXTENSIONS: FrozenSet[str] = frozenset({".jpg", ".jpeg", ".png", ".webp", ".bmp", ".jfif"})
 
 
 def validate_dataset_path(dataset_name: str) -> Path:
@@ -0,0 +1,269 @@
+"""
+Bulk caption edits — services/caption_service.py.
+
+add_trigger_word, remove_tags and replace_text fan per-file work out to worker
+threads. These tests pin the observable results so the concurrency and I/O
+shortcuts can't change what ends up in the caption files.
+
+Bug: images sharing a stem (x.png, x.jpg, x.webp) map to the same x.txt, and
+concurrent read-modify-writes of that one caption lost updates ('tw, tw'
+instead of 'tw, tw, tw') or failed on a shared temp file.
+
+Filesystem only — a temp datasets/ tree, no GPU, no models.
+Run with:  pytest tests/test_caption_service.py -v
+"""
+import asyncio
+import os
+
+import pytest
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    """An empty datasets/<name> directory that validate_dataset_path accepts."""
+    from services.core import validation
+
+    datasets_dir = tmp_path / "datasets"
+    ds = datasets_dir / "capset"
+    ds.mkdir(parents=True)
+    monkeypatch.setattr(validation, "DATASETS_DIR", datasets_dir)
+    return ds
+
+
+@pytest.mark.asyncio
+async def test_add_trigger_word_applies_once_per_image_sharing_a_caption(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import AddTriggerWordRequest
+
+    stems = [f"i{n}" for n in range(200)]
+    for stem in stems:
+        for ext in (".png", ".jpg", ".webp"):
+            (dataset / f"{stem}{ext}").write_bytes(b"")
+
+    result = await CaptionService().add_trigger_word(
+        AddTriggerWordRequest(dataset_dir=str(dataset), trigger_word="tw")
+    )
+
+    assert result.success and result.errors == []
+    assert result.files_modified == len(stems) * 3
+    for stem in stems:
+        assert (dataset / f"{stem}.txt").read_text(encoding="utf-8") == "tw, tw, tw"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_write_caption_to_same_file_never_fails(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import WriteCaptionRequest
+
+    image = dataset / "img.png"
+    image.write_bytes(b"")
+    svc = CaptionService()
+
+    results = await asyncio.gather(*(
+        asyncio.to_thread(
+            asyncio.run,
+            svc.write_caption(WriteCaptionRequest(image_path=str(image), caption_text=f"caption {n}")),
+        )
+        for n in range(32)
+    ))
+
+    assert all(r.success for r in results), [r.errors for r in results if not r.success]
+    assert (dataset / "img.txt").read_text(encoding="utf-8").startswith("caption ")
+    assert sorted(p.name for p in dataset.iterdir()) == ["img.png", "img.txt"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+@pytest.mark.asyncio
+async def test_write_caption_keeps_existing_file_mode(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import WriteCaptionRequest
+
+    image = dataset / "img.png"
+    image.write_bytes(b"")
+    caption = dataset / "img.txt"
+    caption.write_text("old", encoding="utf-8")
+    caption.chmod(0o640)
+
+    result = await CaptionService().write_caption(
+        WriteCaptionRequest(image_path=str(image), caption_text="new")
+    )
+
+    assert result.success
+    assert caption.read_text(encoding="utf-8") == "new"
+    assert caption.stat().st_mode & 0o777 == 0o640
+
+
+@pytest.mark.asyncio
+async def test_caption_extension_matches_case_insensitively_on_windows(dataset, monkeypatch):
+    import ntpath
+
+    from services.caption_service import CaptionService
+    from services.models.caption import RemoveTagsRequest
+
+    # Same matching as Path.glob on Windows, whatever OS runs the test
+    monkeypatch.setattr(os.path, "normcase", ntpath.normcase)
+    (dataset / "IMG.TXT").write_text("cat, dog", encoding="utf-8")
+
+    result = await CaptionService().remove_tags(
+        RemoveTagsRequest(dataset_dir=str(dataset), tags_to_remove=["dog"])
+    )
+
+    assert result.files_modified == 1
+    assert (dataset / "IMG.TXT").read_text(encoding="utf-8") == "cat"
+
+
+@pytest.mark.asyncio
+async def test_dotfile_captions_are_edited_like_glob_did(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import RemoveTagsRequest
+
+    (dataset / ".hidden.txt").write_text("cat, dog", encoding="utf-8")
+
+    result = await CaptionService().remove_tags(
+        RemoveTagsRequest(dataset_dir=str(dataset), tags_to_remove=["dog"])
+    )
+
+    assert result.files_modified == 1
+    assert (dataset / ".hidden.txt").read_text(encoding="utf-8") == "cat"
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_see_captions_added_between_requests(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import RemoveTagsRequest
+
+    svc = CaptionService()
+    request = RemoveTagsRequest(dataset_dir=str(dataset), tags_to_remove=["dog"])
+    (dataset / "a.txt").write_text("cat, dog", encoding="utf-8")
+    assert (await svc.remove_tags(request)).files_modified == 1
+
+    (dataset / "b.txt").write_text("dog, bird", encoding="utf-8")
+    assert (await svc.remove_tags(request)).files_modified == 1
+    assert (dataset / "b.txt").read_text(encoding="utf-8") == "bird"
+
+
+@pytest.mark.asyncio
+async def test_add_trigger_word_respects_position_and_existing_caption(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import AddTriggerWordRequest
+
+    (dataset / "a.png").write_bytes(b"")
+    (dataset / "a.txt").write_text("cat, dog\n", encoding="utf-8")
+    (dataset / "b.jpg").write_bytes(b"")
+    (dataset / "notes.md").write_text("not an image", encoding="utf-8")
+
+    result = await CaptionService().add_trigger_word(
+        AddTriggerWordRequest(dataset_dir=str(dataset), trigger_word="tw", position="end")
+    )
+
+    assert result.files_modified == 2
+    assert (dataset / "a.txt").read_text(encoding="utf-8") == "cat, dog, tw"
+    assert (dataset / "b.txt").read_text(encoding="utf-8") == "tw"
+    assert not (dataset / "notes.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_remove_tags_is_case_insensitive_and_skips_unmatched_files(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import RemoveTagsRequest
+
+    (dataset / "a.txt").write_text("Cat ,  dog,bird", encoding="utf-8")
+    (dataset / "b.txt").write_text("Éclair, Dog", encoding="utf-8")
+    untouched = dataset / "c.txt"
+    untouched.write_text("bird , fish", encoding="utf-8")
+    mtime = untouched.stat().st_mtime_ns
+
+    result = await CaptionService().remove_tags(
+        RemoveTagsRequest(dataset_dir=str(dataset), tags_to_remove=["DOG", "éclair"])
+    )
+
+    assert result.files_modified == 2 and result.errors == []
+    assert (dataset / "a.txt").read_text(encoding="utf-8") == "Cat, bird"
+    assert (dataset / "b.txt").read_text(encoding="utf-8") == ""
+    assert untouched.read_text(encoding="utf-8") == "bird , fish"
+    assert untouched.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.asyncio
+async def test_replace_text_matches_newlines_in_crlf_captions(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import ReplaceTextRequest
+
+    (dataset / "a.txt").write_bytes(b"cat,\r\ndog")
+
+    result = await CaptionService().replace_text(
+        ReplaceTextRequest(dataset_dir=str(dataset), find_text=",\n", replace_text=", ")
+    )
+
+    assert result.files_modified == 1
+    assert (dataset / "a.txt").read_text(encoding="utf-8") == "cat, dog"
+
+
+@pytest.mark.asyncio
+async def test_replace_text_reports_invalid_utf8_without_rewriting(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import ReplaceTextRequest
+
+    broken = dataset / "broken.txt"
+    broken.write_bytes(b"cat, \xff dog")
+
+    result = await CaptionService().replace_text(
+        ReplaceTextRequest(dataset_dir=str(dataset), find_text="cat", replace_text="kitten")
+    )
+
+    assert result.files_modified == 0
+    assert len(result.errors) == 1 and result.errors[0].startswith("broken.txt:")
+    assert broken.read_bytes() == b"cat, \xff dog"
+
+
+@pytest.mark.asyncio
+async def test_replace_text_regex_and_invalid_pattern(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import ReplaceTextRequest
+
+    (dataset / "a.txt").write_text("1girl, solo, 2girls", encoding="utf-8")
+    svc = CaptionService()
+
+    result = await svc.replace_text(ReplaceTextRequest(
+        dataset_dir=str(dataset), find_text=r"\d+girls?", replace_text="person", use_regex=True
+    ))
+    assert result.files_modified == 1
+    assert (dataset / "a.txt").read_text(encoding="utf-8") == "person, solo, person"
+
+    invalid = await svc.replace_text(ReplaceTextRequest(
+        dataset_dir=str(dataset), find_text="(unclosed", use_regex=True
+    ))
+    assert not invalid.success and invalid.files_modified == 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+@pytest.mark.asyncio
+async def test_new_caption_gets_fixed_readable_mode(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import WriteCaptionRequest
+
+    image = dataset / "img.png"
+    image.write_bytes(b"")
+
+    result = await CaptionService().write_caption(
+        WriteCaptionRequest(image_path=str(image), caption_text="new")
+    )
+
+    assert result.success
+    assert (dataset / "img.txt").stat().st_mode & 0o777 == 0o644
+
+
+@pytest.mark.asyncio
+async def test_remove_tags_normalizes_crlf_like_read_text(dataset):
+    from services.caption_service import CaptionService
+    from services.models.caption import RemoveTagsRequest
+
+    (dataset / "a.txt").write_bytes(b"cat,\r\ndog, bird\r\nfish")
+
+    result = await CaptionService().remove_tags(
+        RemoveTagsRequest(dataset_dir=str(dataset), tags_to_remove=["dog"])
+    )
+
+    assert result.files_modified == 1
+    # One newline, translated once to the platform's line ending (no \r\r\n)
+    assert (dataset / "a.txt").read_bytes() == b"cat, bird" + os.linesep.encode() + b"fish"